@@ -1,47 +1,169 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-from database_connection import Database
+from database_connection import Database, OPEN_STATUSES
+from metrics import metrics, timed
+from order_snapshot import OrderSnapshot
+from order_store import OrderRecord, OrderStore
+from poll_scheduler import PollScheduler
+from decouple import config
+import datetime
 import logging
+import threading
+import time
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Changes are re-read this many seconds before the watermark, so status times
+# written by stations whose clocks lag the server are not missed
+DELTA_SYNC_OVERLAP = config("DELTA_SYNC_OVERLAP", default=120, cast=int)
+# Seconds between snapshot writes when nothing changed, to keep its watermark fresh
+SNAPSHOT_INTERVAL = config("SNAPSHOT_INTERVAL", default=60, cast=int)
+# Snapshots older than this many hours are reconciled with a full load instead of a delta
+SNAPSHOT_MAX_AGE = config("SNAPSHOT_MAX_AGE", default=12, cast=int)
+# Most orders sent to the board in one signal, so no single update stalls the GUI thread
+ORDER_CHUNK_SIZE = config("ORDER_CHUNK_SIZE", default=200, cast=int)
+
 class DatabaseWorker(QThread):
     """Worker class for database operations."""
-    new_orders_fetched = pyqtSignal(dict)  # Signal to emit when new orders are fetched
+    orders_changed = pyqtSignal(dict)  # Signal to emit inserted, updated and closed orders
 
-    def __init__(self, max_order_id):
+    def __init__(self, known_statuses, watermark, snapshot=None):
         super().__init__()
-        self.max_order_id = max_order_id
+        self.known_statuses = dict(known_statuses)  # (Section, OrderID) -> status of every order on the boards
+        self.watermark = watermark  # Server time of the last sync, None until the first full load
+        if watermark is not None and datetime.datetime.now() - watermark > datetime.timedelta(hours=SNAPSHOT_MAX_AGE):
+            self.watermark = None  # Too old for a delta; reconcile with a full load
+        self.snapshot = snapshot or OrderSnapshot()
+        self.last_snapshot_time = 0.0
+        self.scheduler = PollScheduler()
+        self.change_count = 0  # Orders emitted during the current poll
+        self.rewind_lock = threading.Lock()
+        self.rewind_to = None  # Tap time of the oldest status write the next delta must reach back to
         self.running = True
     def run(self):
-        """Fetch new orders from the database in a loop."""
+        """Fetch order changes from the database in a loop."""
         while self.running:
+            self.change_count = 0
             try:
-                with Database() as db:
-                    new_orders = db.fetch_new_orders(self.max_order_id)
-                    if new_orders:
-                        grouped_orders = self.group_orders(new_orders)
-                        self.new_orders_fetched.emit(grouped_orders)  # Emit the new orders
-                        self.max_order_id = max(grouped_orders.keys(), default=self.max_order_id)
+                with timed("poll_cycle"), Database() as db:
+                    self.sync_changes(db)
+                self.scheduler.record_changes(self.change_count)
             except Exception as e:
                 logger.error(f"Error in database worker: {e}")
-            self.sleep(5)  # Wait for 5 seconds before fetching again
+                self.scheduler.record_error()
+            self.scheduler.wait()  # Adaptive wait; cut short by wake()
+
+    def wake(self):
+        """Poll now instead of waiting for the next scheduled poll."""
+        self.scheduler.wake()
+
+    def rewind(self, tap_time):
+        """Make the next delta sync reach back to a status write stamped with its tap time.
+
+        A tap flushed from the journal long after it was made keeps its tap
+        time in the status time columns; without a LastModified column, that
+        is the only marker a delta sync can find it by.
+        """
+        with self.rewind_lock:
+            if self.rewind_to is None or tap_time < self.rewind_to:
+                self.rewind_to = tap_time
 
     def stop(self):
-        """Stop the worker thread."""
+        """Stop the worker thread without waiting for the current interval to pass."""
         self.running = False
+        self.scheduler.wake()
+
+    def emit_changes(self, changes):
+        """Send a chunk of changes to the board and record it in the snapshot.
+
+        Changes map (Section, OrderID) keys to OrderRecords: full records for
+        new orders and status-only records for updated and closed ones. Closed orders have a
+        status outside OPEN_STATUSES (or None) and should be removed.
+        """
+        if changes:
+            self.orders_changed.emit(changes)  # Emit the changed orders
+            self.change_count += len(changes)
+            metrics.increment("orders_changed", len(changes))
+        self.save_snapshot(changes)
+
+    def sync_changes(self, db):
+        """Emit the orders inserted, updated or closed since the last sync."""
+        if self.watermark is None:
+            self.full_sync(db)
+            return
+
+        with self.rewind_lock:
+            rewind_to, self.rewind_to = self.rewind_to, None
+        since = min(self.watermark, rewind_to or self.watermark) - datetime.timedelta(seconds=DELTA_SYNC_OVERLAP)
+        headers, server_time = db.fetch_order_changes(since)
+        if server_time is None:
+            if rewind_to is not None:
+                self.rewind(rewind_to)  # Retried with the next poll
+            return
+
+        changes = {}
+        new_order_ids = []
+        for order_id, status, section, _ in headers:
+            key = (section, order_id)
+            known_status = self.known_statuses.get(key)
+            if status in OPEN_STATUSES:
+                if known_status is None:
+                    new_order_ids.append(key)
+                elif known_status != status:
+                    changes[key] = OrderRecord.status_change(order_id, status, section)
+                    self.known_statuses[key] = status
+            elif known_status is not None:
+                changes[key] = OrderRecord.status_change(order_id, status, section)
+                del self.known_statuses[key]
+        # Sent before the new orders' lines are streamed, since known_statuses
+        # already records them and a failed stream would otherwise lose them
+        self.emit_changes(changes)
+
+        # Only new orders need their lines, read for every section at once;
+        # orders missing here are retried while inside the overlap
+        if new_order_ids:
+            for chunk in OrderStore.group_rows(db.iter_orders(new_order_ids), ORDER_CHUNK_SIZE):
+                for key, record in chunk.items():
+                    self.known_statuses[key] = record.status
+                self.emit_changes(chunk)
+        # Moved only once every change is sent, so a failed stream re-reads the same window
+        self.watermark = server_time
+        self.save_snapshot({})  # Refreshes the snapshot's watermark periodically
+
+    def full_sync(self, db):
+        """Stream every open order and diff it against the known orders.
+
+        Used when no usable watermark is known. Chunks of new and updated
+        orders are emitted as they arrive; orders that are known but no longer
+        open are reported with a status of None once the stream is complete.
+        """
+        server_time = db.fetch_server_time()
+        if server_time is None:
+            return
+        open_order_ids = set()
+        for chunk in OrderStore.group_rows(db.iter_orders(), ORDER_CHUNK_SIZE):
+            changes = {}
+            for key, record in chunk.items():
+                open_order_ids.add(key)
+                known_status = self.known_statuses.get(key)
+                if known_status is None:
+                    changes[key] = record
+                elif known_status != record.status:
+                    changes[key] = OrderRecord.status_change(record.order_id, record.status, record.section)
+                self.known_statuses[key] = record.status
+            self.emit_changes(changes)
+
+        changes = {}
+        for key in list(self.known_statuses):
+            if key not in open_order_ids:
+                section, order_id = key
+                changes[key] = OrderRecord.status_change(order_id, None, section)
+                del self.known_statuses[key]
+        self.watermark = server_time
+        self.emit_changes(changes)
 
-    @staticmethod
-    def group_orders(orders):
-        """Group orders by OrderID."""
-        grouped_orders = {}
-        for order in orders:
-            order_id = order[0]
-            if order_id not in grouped_orders:
-                grouped_orders[order_id] = {
-                    "CreatedTime": order[1],
-                    "Description": [],
-                    "Status": order[3],
-                }
-            grouped_orders[order_id]["Description"].append(order[2])
-        return grouped_orders
\ No newline at end of file
+    def save_snapshot(self, changes):
+        """Write changes to the local snapshot, or refresh its watermark periodically."""
+        if changes or (self.watermark is not None and time.monotonic() - self.last_snapshot_time >= SNAPSHOT_INTERVAL):
+            self.snapshot.save_changes(changes, self.watermark)
+            self.last_snapshot_time = time.monotonic()
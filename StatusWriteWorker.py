@@ -0,0 +1,134 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from database_connection import HOME_SECTION, Database
+from metrics import metrics
+from status_journal import StatusJournal
+from decouple import config
+import datetime
+import logging
+import threading
+import time
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after the first queued change so rapid taps share one transaction
+STATUS_WRITE_BATCH_DELAY = config("STATUS_WRITE_BATCH_DELAY", default=0.3, cast=float)
+# Seconds between attempts to flush the journal while the database is unreachable
+STATUS_FLUSH_RETRY_INTERVAL = config("STATUS_FLUSH_RETRY_INTERVAL", default=5, cast=float)
+
+class StatusWriteWorker(QThread):
+    """Worker class that journals status changes and writes them to the database in the background."""
+    write_committed = pyqtSignal(str, int, str)   # Section, OrderID, status that was committed
+    write_failed = pyqtSignal(str, int, str, str)  # Section, OrderID, status the database rejected, error message
+    backlog_changed = pyqtSignal(int)         # Journaled changes still waiting for the database
+    statuses_enqueued = pyqtSignal(str, dict)  # Section, OrderID -> status of a tap that was journaled
+    batch_written = pyqtSignal(object)        # Time of the oldest tap in a batch that reached the database
+
+    def __init__(self, journal=None):
+        super().__init__()
+        self.journal = journal or StatusJournal()
+        self.condition = threading.Condition()
+        self.has_pending = bool(self.journal.pending())  # Taps left over from a previous run are replayed first
+        self.running = True
+
+    def enqueue(self, order_id, new_status, section=HOME_SECTION):
+        """Journal a status change; see enqueue_many."""
+        return self.enqueue_many({order_id: new_status}, section)
+
+    def enqueue_many(self, new_statuses, section=HOME_SECTION):
+        """Journal OrderID -> status changes of one section together, timestamped now rather than when they are written.
+
+        Returns False if the changes could not be recorded durably, in which
+        case they must not be shown as done.
+        """
+        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if not self.journal.append((section, order_id, status, timestamp) for order_id, status in new_statuses.items()):
+            return False
+        self.statuses_enqueued.emit(section, new_statuses)
+        with self.condition:
+            self.has_pending = True
+            self.condition.notify()
+        return True
+
+    def run(self):
+        """Flush journaled changes until stopped; unflushed changes stay journaled for the next start."""
+        while True:
+            with self.condition:
+                while self.running and not self.has_pending:
+                    self.condition.wait()
+                if not self.has_pending:
+                    return
+                # Give rapid follow-up taps a moment to join this batch
+                deadline = time.monotonic() + STATUS_WRITE_BATCH_DELAY
+                while self.running and time.monotonic() < deadline:
+                    self.condition.wait(deadline - time.monotonic())
+                self.has_pending = False
+            if self.flush():
+                continue
+            with self.condition:
+                self.has_pending = True
+                if not self.running:
+                    return
+                self.condition.wait(STATUS_FLUSH_RETRY_INTERVAL)  # A new tap retries sooner
+
+    def flush(self):
+        """Replay the journal in tap order as one batch per section; returns False if the database was unreachable."""
+        entries = self.journal.pending()
+        if not entries:
+            return True
+        batches = {}  # Section -> OrderID -> [(status, timestamp), ...] in the order they were tapped
+        seqs = {}     # Section -> journal entries of its batch
+        for seq, section, order_id, status, timestamp in entries:
+            batches.setdefault(section, {}).setdefault(order_id, []).append((status, timestamp))
+            seqs.setdefault(section, []).append(seq)
+        for section, batch in batches.items():
+            results = self.write_batch(batch, section)
+            if results is None:
+                metrics.increment("status_flush_retries")
+                self.backlog_changed.emit(len(self.journal.pending()))
+                return False
+
+            self.journal.acknowledge(seqs[section])
+            oldest = min(timestamp for steps in batch.values() for _, timestamp in steps)
+            self.batch_written.emit(datetime.datetime.strptime(oldest, '%Y-%m-%d %H:%M:%S'))
+            for order_id, error in results.items():
+                new_status = batch[order_id][-1][0]
+                if error is None:
+                    self.write_committed.emit(section, order_id, new_status)
+                else:
+                    metrics.increment("status_writes_failed")
+                    self.write_failed.emit(section, order_id, new_status, error)
+        self.backlog_changed.emit(0)
+        return True
+
+    def write_batch(self, batch, section=HOME_SECTION):
+        """Write one batch of coalesced transitions of a section in a single transaction.
+
+        Returns OrderID -> None or the reason the database rejected it, or
+        None if the database could not be reached and the batch must be retried.
+        """
+        try:
+            with Database() as db:
+                return db.update_statuses(batch, section)
+        except Exception as e:
+            backend = Database.backend
+            if backend is None or not isinstance(e, backend.Error) or backend.is_connectivity_error(e):
+                # Unreachable database, no free pooled connection, ...: the journal keeps the changes
+                logger.warning(f"Database unavailable, keeping {len(batch)} status changes journaled: {e}")
+                return None
+            if len(batch) == 1:
+                return {order_id: str(e) for order_id in batch}
+            # Find the rejected order by writing the batch one order at a time
+            results = {}
+            for order_id, steps in batch.items():
+                result = self.write_batch({order_id: steps}, section)
+                if result is None:
+                    return None
+                results.update(result)
+            return results
+
+    def stop(self):
+        """Stop the worker thread after one last attempt to flush the journal."""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
@@ -0,0 +1,72 @@
+# action_button_delegate.py
+from PyQt6.QtCore import Qt, QEvent, QModelIndex, QRect, QRectF, QSize, pyqtSignal
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+from order_table_model import STATUS_COLUMN, cached_brush, cached_font
+
+# Button colors, matching the board's green theme
+BUTTON_COLOR = "#4CAF50"           # Green button
+BUTTON_HOVER_COLOR = "#45a049"     # Darker green on hover
+BUTTON_DISABLED_COLOR = "#cccccc"  # Gray for disabled buttons
+BUTTON_TEXT_COLOR = "#ffffff"
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Paints the status action button instead of embedding a QPushButton per row."""
+    clicked = pyqtSignal(QModelIndex)  # Emitted when the painted button is clicked
+
+    BUTTON_SIZE = 30
+    BUTTON_TEXT = "✓"
+
+    def button_rect(self, cell_rect):
+        """Return the button rectangle centered in the cell."""
+        rect = QRect(0, 0, self.BUTTON_SIZE, self.BUTTON_SIZE)
+        rect.moveCenter(cell_rect.center())
+        return rect
+
+    @staticmethod
+    def is_enabled(index):
+        """Delivered orders can no longer be advanced."""
+        return index.siblingAtColumn(STATUS_COLUMN).data() != "Delivered"
+
+    def paint(self, painter, option, index):
+        """Paint the cell background and a rounded button."""
+        background = index.data(Qt.ItemDataRole.BackgroundRole)
+        if background is not None:
+            painter.fillRect(option.rect, background)
+
+        if not self.is_enabled(index):
+            color = BUTTON_DISABLED_COLOR
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            color = BUTTON_HOVER_COLOR
+        else:
+            color = BUTTON_COLOR
+
+        rect = self.button_rect(option.rect)
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(cached_brush(color))
+        painter.drawRoundedRect(QRectF(rect), 5, 5)
+        painter.setPen(cached_brush(BUTTON_TEXT_COLOR).color())
+        painter.setFont(cached_font(14))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.BUTTON_TEXT)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(self.BUTTON_SIZE + 10, self.BUTTON_SIZE + 10)
+
+    def editorEvent(self, event, model, option, index):
+        """Emit clicked when the mouse is released over an enabled button.
+
+        Presses over the button are consumed too, so tapping it does not
+        also toggle the row in a multi-selection.
+        """
+        if (
+            event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick, QEvent.Type.MouseButtonRelease)
+            and event.button() == Qt.MouseButton.LeftButton
+            and self.button_rect(option.rect).contains(event.position().toPoint())
+        ):
+            if event.type() == QEvent.Type.MouseButtonRelease and self.is_enabled(index):
+                self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
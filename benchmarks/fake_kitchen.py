@@ -0,0 +1,96 @@
+# benchmarks/fake_kitchen.py
+"""Generates kitchen data in a SQLite database for the SQLite backend."""
+from db_backends import SqliteBackend
+from typing import Iterable, List
+import datetime
+import random
+import sqlite3
+
+DISHES = ("بيتزا مارجريتا", "بيتزا خضار", "بيتزا دجاج باربكيو", "فطيرة جبن", "كالزوني", "مكرونة بالصلصة",
+          "سلطة سيزر", "بطاطس مقلية", "خبز بالثوم", "أجنحة دجاج")
+SIZES = ("صغير", "وسط", "كبير")
+
+
+class FakeKitchen:
+    """Fills a SQLite kitchen database with items and N orders of M lines each."""
+    def __init__(self, path: str, item_count: int = 150, seed: int = 0):
+        self.backend = SqliteBackend(path)
+        self.conn = self.backend.connect()
+        self.conn.execute("PRAGMA journal_mode=WAL")  # The board's threads read while orders are written
+        self.random = random.Random(seed)
+        self.item_codes = self.add_items(item_count)
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self):
+        """Delete every order, keeping the items."""
+        with self.conn:
+            self.conn.execute("DELETE FROM kitchenOrdersLines")
+            self.conn.execute("DELETE FROM kitchenOrders")
+
+    def add_items(self, count: int) -> List[int]:
+        """Create ``count`` kitchen items with Arabic descriptions and return their codes."""
+        items = [
+            (1000 + code, f"{DISHES[code % len(DISHES)]} {SIZES[code // len(DISHES) % len(SIZES)]} {code}")
+            for code in range(count)
+        ]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO KitchenItems VALUES (?, ?)", items)
+        return [item_code for item_code, _ in items]
+
+    def next_order_id(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(OrderID), 0) + 1 FROM kitchenOrders").fetchone()[0]
+
+    def add_orders(self, count: int, lines_per_order: int = 3, status: str = "Placed",
+                   created_time: datetime.datetime = None, order_type: str = "Desktop") -> List[int]:
+        """Insert ``count`` orders with ``lines_per_order`` lines each and return their OrderIDs."""
+        created_time = (created_time or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        first_id = self.next_order_id()
+        order_ids = list(range(first_id, first_id + count))
+        lines = [
+            (order_id, self.random.choice(self.item_codes), self.random.randint(1, 4))
+            for order_id in order_ids
+            for _ in range(lines_per_order)
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO kitchenOrders (OrderID, OrderType, Status, CreatedTime) VALUES (?, ?, ?, ?)",
+                [(order_id, order_type, status, created_time) for order_id in order_ids],
+            )
+            self.conn.executemany("INSERT INTO kitchenOrdersLines VALUES (?, ?, ?)", lines)
+        return order_ids
+
+    def set_status(self, order_ids: Iterable[int], status: str, time_column: str):
+        """Move orders to a status the way another station would, stamping ``time_column``."""
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.executemany(
+                f"UPDATE kitchenOrders SET Status = ?, {time_column} = ? WHERE OrderID = ?",
+                [(status, timestamp, order_id) for order_id in order_ids],
+            )
+
+    def status_of(self, order_id: int) -> str:
+        row = self.conn.execute("SELECT Status FROM kitchenOrders WHERE OrderID = ?", (order_id,)).fetchone()
+        return row[0] if row else None
+
+
+def create_database(path: str, order_count: int, lines_per_order: int = 3, seed: int = 0) -> FakeKitchen:
+    """Create a kitchen database at ``path`` with ``order_count`` open orders."""
+    kitchen = FakeKitchen(path, seed=seed)
+    kitchen.reset()
+    kitchen.add_orders(order_count, lines_per_order)
+    return kitchen
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Create a SQLite kitchen database for DB_BACKEND=sqlite.")
+    parser.add_argument("path")
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=3)
+    args = parser.parse_args()
+    try:
+        create_database(args.path, args.orders, args.lines).close()
+    except sqlite3.Error as e:
+        parser.error(str(e))
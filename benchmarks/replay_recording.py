@@ -0,0 +1,202 @@
+# benchmarks/replay_recording.py
+"""Replays a recorded service against headless boards and reports UI latency and memory growth.
+
+Record a service by starting the app with ORDER_RECORDING_DIR set, then run
+from the repository root:
+    python -m benchmarks.replay_recording <recording> [--speed 1|10|max] [--output replay_output.txt]
+
+Poll results are fed through the orders_changed signal the database worker
+uses, and status taps through the boards' optimistic update, followed by the
+status writer's write_committed signal in place of the database. No database
+is needed. Each event is timed from its emission until the event loop is idle
+again, repaint included. Memory is traced with tracemalloc, which slows
+Python down; pass --no-tracemalloc for latencies closer to a live board.
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Before Qt is imported
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QTabWidget
+from database_connection import BOARD_ORDER_TYPES, HOME_SECTION
+from order_recorder import read_recording
+from order_sync import OrderSync
+from order_table_widget import OrderTableWidget
+from status_journal import StatusJournal
+
+SLOWEST_EVENTS = 10     # Slowest events listed in the report
+MEMORY_TOP_SITES = 10   # Allocation sites with the most growth listed in the report
+
+
+class ReplaySource(QObject):
+    """Stands in for the DatabaseWorker, emitting recorded change sets."""
+    orders_changed = pyqtSignal(dict)
+
+
+def build_boards(state, events):
+    """Create an OrderSync with one board per section and order type seen in the recording."""
+    boards = {(record.section, record.order_type or BOARD_ORDER_TYPES[0]) for record in state.values()}
+    for _, kind, payload in events:
+        if kind == "changes":
+            boards.update((record.section, record.order_type) for record in payload.values() if record.order_type)
+    if not boards:
+        boards = {(HOME_SECTION, BOARD_ORDER_TYPES[0])}
+    journal = StatusJournal(os.path.join(tempfile.mkdtemp(prefix="replay_"), "journal.db"))
+    sync = OrderSync(state, journal=journal)
+    # Taps are journaled but never written; the replay confirms them in place of the database
+    sync.status_writer.stop()
+    sync.status_writer.wait()
+    tabs = QTabWidget()
+    for section, order_type in sorted(boards):
+        board = OrderTableWidget(sync.board_orders(section, order_type), sync.status_writer, section, order_type)
+        sync.add_board(board)
+        tabs.addTab(board, f"{section} · {order_type}")
+    tabs.resize(1200, 800)
+    tabs.show()
+    return sync, tabs
+
+
+def run_until(app, deadline):
+    """Run the event loop until ``deadline`` (perf_counter seconds), so timers such as the elapsed column keep ticking."""
+    while True:
+        app.processEvents()
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 0.005))
+
+
+def replay_tap(sync, section, new_statuses):
+    """Apply a recorded tap on the boards that show its orders, then confirm it like a committed write."""
+    for board in sync.section_boards.get(section, ()):
+        statuses = {order_id: status for order_id, status in new_statuses.items() if board.model.has_order(order_id)}
+        if statuses:
+            board.set_statuses_optimistically(statuses)
+    for order_id, status in new_statuses.items():
+        sync.status_writer.write_committed.emit(section, order_id, status)
+
+
+def replay(app, events, speed, trace_memory):
+    """Replay ``events`` and return the per-event timings, the boards' final row counts and memory samples."""
+    state = events[0][2] if events and events[0][1] == "state" else {}
+    if trace_memory:
+        tracemalloc.start()
+    sync, tabs = build_boards(state, events)
+    source = ReplaySource()
+    source.orders_changed.connect(sync.route_changes)
+    app.processEvents()
+    memory = {}
+    if trace_memory:
+        memory["baseline"] = tracemalloc.get_traced_memory()[0]
+        memory["snapshot"] = tracemalloc.take_snapshot()
+
+    timings = []  # (kind, seconds into the recording, orders in the event, latency, lag behind schedule)
+    start = time.perf_counter()
+    for seconds, kind, payload in events:
+        if kind == "state":
+            continue
+        lag = 0.0
+        if speed:
+            due = start + seconds / speed
+            lag = max(time.perf_counter() - due, 0.0)
+            run_until(app, due)
+        emitted = time.perf_counter()
+        if kind == "changes":
+            source.orders_changed.emit(payload)
+            size = len(payload)
+        else:
+            section, new_statuses = payload
+            replay_tap(sync, section, new_statuses)
+            size = len(new_statuses)
+        app.processEvents()  # Includes the repaint
+        timings.append((kind, seconds, size, time.perf_counter() - emitted, lag))
+
+    row_counts = {(board.section, board.order_type): board.model.rowCount() for board in sync.boards.values()}
+    if trace_memory:
+        memory["final"], memory["peak"] = tracemalloc.get_traced_memory()
+        memory["growth"] = tracemalloc.take_snapshot().compare_to(memory.pop("snapshot"), "lineno")[:MEMORY_TOP_SITES]
+        tracemalloc.stop()
+    sync.stop()
+    tabs.close()
+    tabs.deleteLater()
+    app.processEvents()
+    return timings, row_counts, memory
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def format_report(path, speed, timings, row_counts, memory):
+    report = [f"Replay of {path} at {f'{speed:g}x' if speed else 'maximum'} speed"]
+    report.append(f"{'event':<10} {'count':>7} {'median ms':>10} {'p95 ms':>9} {'max ms':>9} {'orders':>8}")
+    for kind in ("changes", "statuses"):
+        latencies = [latency for event_kind, _, _, latency, _ in timings if event_kind == kind]
+        if latencies:
+            orders = sum(size for event_kind, _, size, _, _ in timings if event_kind == kind)
+            report.append(
+                f"{kind:<10} {len(latencies):>7} {statistics.median(latencies) * 1000:>10.2f} "
+                f"{percentile(latencies, 0.95) * 1000:>9.2f} {max(latencies) * 1000:>9.2f} {orders:>8}"
+            )
+    if speed and timings:
+        report.append(f"Largest lag behind the recorded schedule: {max(lag for *_, lag in timings) * 1000:.1f} ms")
+
+    report.append("")
+    report.append("Slowest events:")
+    slowest = sorted(timings, key=lambda timing: timing[3], reverse=True)[:SLOWEST_EVENTS]
+    for kind, seconds, size, latency, _ in slowest:
+        report.append(f"  {seconds:>10.3f} s  {kind:<9} {size:>6} orders  {latency * 1000:>9.2f} ms")
+
+    report.append("")
+    report.append("Rows on the boards at the end: " + ", ".join(
+        f"{section} · {order_type} {count}" for (section, order_type), count in sorted(row_counts.items())
+    ))
+
+    if memory:
+        report.append("")
+        report.append(
+            f"Traced memory: {memory['baseline'] / 1024:,.0f} KiB after the initial state, "
+            f"{memory['final'] / 1024:,.0f} KiB at the end ({(memory['final'] - memory['baseline']) / 1024:+,.0f} KiB), "
+            f"peak {memory['peak'] / 1024:,.0f} KiB"
+        )
+        report.append("Largest growth by allocation site:")
+        for stat in memory["growth"]:
+            frame = stat.traceback[0]
+            report.append(f"  {stat.size_diff / 1024:>+9.1f} KiB {stat.count_diff:>+8} blocks  {frame.filename}:{frame.lineno}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded service against headless order boards.")
+    parser.add_argument("recording", help="Recording written with ORDER_RECORDING_DIR set")
+    parser.add_argument("--speed", default="1", help="Replay speed: a factor such as 1 or 10, or max for no pauses")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip memory tracing")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the application's info logging")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    speed = 0.0 if args.speed == "max" else float(args.speed)
+    if speed < 0:
+        parser.error("--speed must be positive or max")
+
+    app = QApplication(sys.argv)
+    events = list(read_recording(args.recording))
+    timings, row_counts, memory = replay(app, events, speed, not args.no_tracemalloc)
+
+    text = "\n".join(format_report(args.recording, speed, timings, row_counts, memory))
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/run_benchmarks.py
+"""Times the board's hot paths against the SQLite backend on a headless Qt platform.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks [--sizes 100,1000,10000] [--lines 3] [--output bench_output.txt]
+
+For each number of open orders it measures:
+    grouping      OrderStore.group_rows over every open order line
+    initial load  board start until every order is on screen (full sync)
+    poll→screen   new orders committed until they are on screen (delta sync after a wake)
+    append        one chunk of new orders applied to the board, including the repaint
+    round-trip    a status tap until its database write is committed
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Before Qt is imported
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from PyQt6.QtWidgets import QApplication
+from benchmarks.fake_kitchen import FakeKitchen
+from database_connection import Database
+from DatabaseWorker import ORDER_CHUNK_SIZE
+from order_snapshot import OrderSnapshot
+from status_journal import StatusJournal
+from order_store import OrderRecord, OrderStore
+from order_sync import OrderSync
+from order_table_widget import OrderTableWidget
+
+ROUNDS = 5  # Repetitions of each timed step; the median is reported
+
+
+def wait_until(app, predicate, timeout=120.0):
+    """Run the event loop until ``predicate`` is true; returns the elapsed seconds."""
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("Benchmark step timed out.")
+        app.processEvents()
+        time.sleep(0.0005)
+    return time.perf_counter() - start
+
+
+def bench_grouping():
+    """Return the median seconds to group all open order lines."""
+    with Database() as db:
+        rows = [row for batch in db.iter_orders() for row in batch]
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in OrderStore.group_rows([rows], ORDER_CHUNK_SIZE):
+            pass
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(rows)
+
+
+def bench_board(app, kitchen, directory, order_count):
+    """Start a board on the fake kitchen and time its sync, append and status paths."""
+    results = {}
+    snapshot = OrderSnapshot(os.path.join(directory, f"snapshot_{order_count}.db"))
+    start = time.perf_counter()
+    journal = StatusJournal(os.path.join(directory, f"journal_{order_count}.db"))
+    sync = OrderSync({}, None, snapshot, journal)
+    board = OrderTableWidget({}, sync.status_writer)
+    sync.add_board(board)
+    sync.start()
+    board.resize(1200, 800)
+    board.show()
+    wait_until(app, lambda: board.model.rowCount() == order_count)
+    results["initial load"] = time.perf_counter() - start
+
+    # Poll to screen: orders written by the till appear after the next (woken) poll
+    timings = []
+    for _ in range(ROUNDS):
+        new_ids = kitchen.add_orders(10)
+        start = time.perf_counter()
+        sync.database_worker.wake()
+        wait_until(app, lambda: board.model.has_order(new_ids[-1]))
+        timings.append(time.perf_counter() - start)
+    results["poll→screen"] = statistics.median(timings)
+
+    # Append: one worker-sized chunk of new orders, applied the way the worker's signal is
+    timings = []
+    next_id = kitchen.next_order_id() + 1_000_000  # Board-only orders the database never reports
+    template = board.model.record_of(board.model.order_id_at(0))
+    for _ in range(ROUNDS):
+        chunk = {
+            order_id: OrderRecord(order_id, template.created_time, template.description, "Placed")
+            for order_id in range(next_id, next_id + ORDER_CHUNK_SIZE)
+        }
+        next_id += ORDER_CHUNK_SIZE
+        start = time.perf_counter()
+        board.apply_order_changes(chunk)
+        app.processEvents()  # Includes the repaint
+        timings.append(time.perf_counter() - start)
+    results["append"] = statistics.median(timings)
+
+    # Status round-trip: tap to committed write; the optimistic update itself is timed separately
+    committed = set()
+    sync.status_writer.write_committed.connect(lambda section, order_id, status: committed.add(order_id))
+    tap_timings, write_timings = [], []
+    order_ids = kitchen.add_orders(ROUNDS)
+    sync.database_worker.wake()
+    wait_until(app, lambda: board.model.has_order(order_ids[-1]))
+    for order_id in order_ids:
+        start = time.perf_counter()
+        board.set_status_optimistically(order_id, "Started")
+        tap_timings.append(time.perf_counter() - start)
+        wait_until(app, lambda: order_id in committed)
+        write_timings.append(time.perf_counter() - start)
+    results["tap→screen"] = statistics.median(tap_timings)
+    results["round-trip"] = statistics.median(write_timings)
+
+    sync.stop()
+    board.close()
+    board.deleteLater()
+    app.processEvents()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the order board against a fake kitchen database.")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated numbers of open orders")
+    parser.add_argument("--lines", type=int, default=3, help="Lines per order")
+    parser.add_argument("--output", help="Also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the application's info logging")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    app = QApplication(sys.argv)
+    report = [f"{'orders':>8} {'step':<14} {'median ms':>10}  notes"]
+    with tempfile.TemporaryDirectory() as directory:
+        kitchen = FakeKitchen(os.path.join(directory, "kitchen.db"))
+        Database.use_backend(kitchen.backend)
+        for order_count in (int(size) for size in args.sizes.split(",")):
+            kitchen.reset()
+            kitchen.add_orders(order_count, args.lines)
+            seconds, row_count = bench_grouping()
+            report.append(f"{order_count:>8} {'grouping':<14} {seconds * 1000:>10.2f}  "
+                          f"{row_count / seconds:,.0f} lines/s")
+            notes = {"append": f"{ORDER_CHUNK_SIZE} orders per chunk"}
+            for step, seconds in bench_board(app, kitchen, directory, order_count).items():
+                report.append(f"{order_count:>8} {step:<14} {seconds * 1000:>10.2f}  {notes.get(step, '')}".rstrip())
+            Database.close_pool()
+        kitchen.close()
+
+    text = "\n".join(report)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
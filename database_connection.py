@@ -1,131 +1,625 @@
-import pyodbc
-from decouple import config
-from typing import List, Tuple
+from db_backends import DB_SECTIONS, HOME_SECTION, create_backend
+from metrics import metrics, timed
+from decouple import Csv, config
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from decimal import Decimal, ROUND_HALF_UP
 import datetime
 import logging
+import threading
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Statuses of orders that are still shown on the board
+OPEN_STATUSES = ("Placed", "Started", "Ready")
+
+# Statuses in the order an order moves through them
+STATUS_SEQUENCE = ("Placed", "Started", "Ready", "Delivered")
+
+# Timestamp column stamped when an order moves to each status
+STATUS_TIME_COLUMNS = {
+    "Started": "StartedTime",
+    "Ready": "ReadyTime",
+    "Delivered": "DeliverdTime",
+}
+
+# Order types shown on the boards, one tab per section and order type
+BOARD_ORDER_TYPES = config("BOARD_ORDER_TYPES", default="Desktop", cast=Csv())
+
+# Compact open order lines of one section; descriptions are rendered
+# client-side from the cached KitchenItems catalogue. {filter} narrows the
+# orders; the other placeholders are filled in per section and backend.
+# The sections are combined with UNION ALL into one query
+ORDER_LINES_QUERY = """
+    SELECT
+        a.OrderID AS OrderID,
+        {created_time},
+        b.ItemCode,
+        b.Qty,
+        a.[Status],
+        {section} AS Section,
+        a.OrderType
+    FROM {orders_table} a
+    JOIN {lines_table} b ON a.OrderID = b.OrderID
+    WHERE a.OrderType IN ({order_types})
+        AND a.Status IN ('Placed', 'Started', 'Ready')
+        {filter}
+"""
+
+# Headers of one section's orders created or moved to a new status since a
+# watermark; {filter} holds the range condition on one change marker column
+ORDER_CHANGES_QUERY = """
+    SELECT
+        a.OrderID AS OrderID,
+        a.[Status],
+        {section} AS Section,
+        a.OrderType
+    FROM {orders_table} a
+    WHERE a.OrderType IN ({order_types})
+        {filter}
+"""
+
+# Columns that mark an order as changed since a watermark. Status writes of
+# this app also stamp LastModified with the server time, where a section's
+# database has it (see migrations/add_last_modified.sql), so taps flushed late
+# from the journal are seen; the status time columns keep the tap time. Each
+# column is indexed (migrations/add_change_marker_indexes.sql)
+CHANGE_MARKER_COLUMNS = ("CreatedTime", "StartedTime", "ReadyTime", "DeliverdTime")
+
+# One section's delivered orders older than a keyset cursor, newest first.
+# {after} holds the cursor condition and {top}/{limit} the backend's row limit
+HISTORY_QUERY = """
+    SELECT {top}
+        {section} AS Section,
+        a.OrderID,
+        {created_time},
+        {delivered_time}
+    FROM {orders_table} a
+    WHERE a.OrderType IN ({order_types})
+        AND a.Status = 'Delivered'
+        AND a.DeliverdTime IS NOT NULL
+        {after}
+    ORDER BY a.DeliverdTime DESC, a.OrderID DESC
+    {limit}
+"""
+
+# Rows read per fetchmany call when streaming orders
+DB_FETCH_BATCH_SIZE = config("DB_FETCH_BATCH_SIZE", default=500, cast=int)
+
+# Seconds before the cached KitchenItems catalogue is checked for changes
+ITEM_CACHE_TTL = config("ITEM_CACHE_TTL", default=300, cast=float)
+
+# Connection pool settings
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=4, cast=int)
+DB_POOL_IDLE_TIMEOUT = config("DB_POOL_IDLE_TIMEOUT", default=300, cast=float)  # Seconds before an idle connection is closed
+DB_POOL_CHECK_INTERVAL = config("DB_POOL_CHECK_INTERVAL", default=30, cast=float)  # Seconds between health checks of an idle connection
+DB_POOL_ACQUIRE_TIMEOUT = config("DB_POOL_ACQUIRE_TIMEOUT", default=30, cast=float)  # Seconds to wait for a free connection
+
+
+def sql_literal(value: str) -> str:
+    """Quote a configured name as an SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def format_quantity(qty) -> str:
+    """Format a quantity like SQL Server's replace(str(Qty), ' ', ''): rounded to a whole number."""
+    return str(Decimal(str(qty)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of long-lived database connections."""
+    def __init__(self, connect: Callable[[], object], backend, size: int = DB_POOL_SIZE,
+                 idle_timeout: float = DB_POOL_IDLE_TIMEOUT, check_interval: float = DB_POOL_CHECK_INTERVAL):
+        self.connect = connect
+        self.backend = backend
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self._idle = []  # (connection, returned_at) pairs, most recently used last
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)  # Limits connections in use at once
+
+    def acquire(self, timeout: float = DB_POOL_ACQUIRE_TIMEOUT) -> object:
+        """Borrow a healthy connection, opening a new one if none is idle."""
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolTimeoutError(f"No database connection available after {timeout} seconds.")
+        try:
+            conn = self._take_idle()
+            return conn if conn is not None else self.connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: object, discard: bool = False):
+        """Return a borrowed connection, closing it instead if it is broken."""
+        try:
+            if discard or self.backend.is_closed(conn):
+                self._close(conn)
+            else:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def evict_idle(self):
+        """Close connections that have been idle longer than the idle timeout."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [conn for conn, returned_at in self._idle if now - returned_at > self.idle_timeout]
+            self._idle = [(conn, returned_at) for conn, returned_at in self._idle if now - returned_at <= self.idle_timeout]
+        for conn in expired:
+            self._close(conn)
+        if expired:
+            logger.info(f"Evicted {len(expired)} idle database connections.")
+
+    def close_all(self):
+        """Close every idle connection in the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _take_idle(self) -> Optional[object]:
+        """Pop the most recently used idle connection that passes a health check."""
+        self.evict_idle()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, returned_at = self._idle.pop()
+            # Connections used recently are trusted without a round-trip
+            if time.monotonic() - returned_at < self.check_interval or self._is_healthy(conn):
+                return conn
+            logger.warning("Discarding a broken pooled database connection.")
+            self._close(conn)
+
+    def _is_healthy(self, conn: object) -> bool:
+        """Run a trivial query to check that the connection is still usable."""
+        try:
+            with self.backend.cursor(conn) as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            return True
+        except self.backend.Error:
+            return False
+
+    def _close(self, conn: object):
+        try:
+            if not self.backend.is_closed(conn):
+                conn.close()
+        except self.backend.Error as e:
+            logger.error(f"Error closing the database connection: {e}")
+
+
 class Database:
+    backend = None  # Shared database backend, created from DB_BACKEND on first use
+    _pool = None  # Shared ConnectionPool, created on first use
+    _pool_lock = threading.Lock()
+    _catalogue = {}               # ItemCode -> Arabic description, shared by all connections
+    _catalogue_version = None     # Checksum of KitchenItems when the catalogue was loaded
+    _catalogue_checked_at = None  # time.monotonic() of the last load or version check
+    _unknown_item_codes = set()   # Codes still missing after a refresh, not retried until the next version
+    _catalogue_lock = threading.Lock()
+    _last_modified = {}           # Section -> whether its kitchenOrders has the LastModified column
+
     def __init__(self):
-        """Initialize the database connection."""
-        # Load database credentials from environment variables
-        self.DB_SERVER = config("DB_SERVER")
-        self.DB_NAME = config("DB_NAME")
-        self.DB_USER = config("DB_USER")
-        self.DB_PASSWORD = config("DB_PASSWORD")
-        self.conn = self.create_connection()
-
-    def create_connection(self) -> pyodbc.Connection:
+        """Borrow a database connection from the shared pool."""
+        self.broken = False  # Set when the connection fails and must not be reused
+        self.conn = self.pool().acquire()
+
+    def pool(self) -> ConnectionPool:
+        """Return the shared connection pool, creating it and the backend if needed."""
+        with Database._pool_lock:
+            if Database.backend is None:
+                Database.backend = create_backend()
+            if Database._pool is None:
+                Database._pool = ConnectionPool(self.create_connection, Database.backend)
+            return Database._pool
+
+    @classmethod
+    def close_pool(cls):
+        """Close all pooled connections, e.g. when the application exits."""
+        with cls._pool_lock:
+            if cls._pool is not None:
+                cls._pool.close_all()
+                cls._pool = None
+
+    @classmethod
+    def use_backend(cls, backend):
+        """Switch to another database backend, e.g. the SQLite stand-in, dropping pooled connections and cached items."""
+        cls.close_pool()
+        with cls._catalogue_lock:
+            cls.backend = backend
+            cls._catalogue = {}
+            cls._catalogue_version = None
+            cls._catalogue_checked_at = None
+            cls._unknown_item_codes = set()
+
+    def create_connection(self) -> object:
         """Create a new database connection."""
         try:
-            conn = pyodbc.connect(
-                Driver="{ODBC Driver 17 for SQL Server}",
-                Server=self.DB_SERVER,
-                Database=self.DB_NAME,
-                uid=self.DB_USER,
-                pwd=self.DB_PASSWORD,
-                timeout=30,  # Add a connection timeout
-            )
+            with timed("db_connect"):
+                conn = self.backend.connect()
             logger.info("Database connection established successfully.")
             return conn
-        except pyodbc.Error as e:
+        except self.backend.Error as e:
             logger.error(f"Error connecting to the database: {e}")
             raise
 
-    def fetch_all_orders(self) -> List[Tuple]:
-        """Fetch all orders from the database."""
-        return self.fetch_orders()
+    def cursor(self):
+        """Return a cursor on this connection for use in a with statement."""
+        return self.backend.cursor(self.conn)
+
+    def has_last_modified(self, section: str = HOME_SECTION) -> bool:
+        """Return whether a section's kitchenOrders has the LastModified column, checked once per process.
+
+        The column is added by a DBA with migrations/add_last_modified.sql;
+        until then changes are found through the status time columns alone.
+        """
+        has_column = Database._last_modified.get(section)
+        if has_column is None:
+            with self.cursor() as cursor:
+                cursor.execute(self.backend.column_exists_sql("kitchenOrders", "LastModified", section))
+                has_column = Database._last_modified[section] = cursor.fetchone()[0] is not None
+            if not has_column:
+                logger.warning(f"{section} has no LastModified column; late status writes are found by rewinding the sync.")
+        return has_column
+
+    def change_markers(self, section: str = HOME_SECTION) -> tuple:
+        """Return the columns that mark a section's orders as changed."""
+        return CHANGE_MARKER_COLUMNS + (("LastModified",) if self.has_last_modified(section) else ())
+
+    def item_catalogue(self, force_refresh: bool = False) -> Dict[object, str]:
+        """Return the cached KitchenItems catalogue, reloading it when its version changes.
+
+        The version is checked at most every ITEM_CACHE_TTL seconds unless a
+        refresh is forced. The cached catalogue is kept if the check fails.
+        """
+        with Database._catalogue_lock:
+            now = time.monotonic()
+            checked_at = Database._catalogue_checked_at
+            if force_refresh or checked_at is None or now - checked_at >= ITEM_CACHE_TTL:
+                version = self.fetch_catalogue_version()
+                if version is not None and (force_refresh or version != Database._catalogue_version):
+                    catalogue = self.fetch_item_catalogue()
+                    if catalogue is not None:
+                        Database._catalogue = catalogue
+                        Database._catalogue_version = version
+                        Database._unknown_item_codes = set()
+                        logger.info(f"Loaded {len(catalogue)} kitchen items into the catalogue cache.")
+                Database._catalogue_checked_at = now
+            return Database._catalogue
+
+    def fetch_catalogue_version(self) -> Optional[int]:
+        """Return a checksum of KitchenItems that changes when any item changes."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(self.backend.catalogue_version_sql)
+                version = cursor.fetchone()[0]
+                return version if version is not None else 0  # Empty table
+        except self.backend.Error as e:
+            logger.error(f"Error fetching the item catalogue version: {e}")
+            self.broken = True
+            return None
+
+    def fetch_item_catalogue(self) -> Optional[Dict[object, str]]:
+        """Fetch every kitchen item's Arabic description, keyed by ItemCode."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute("SELECT ItemCode, ItemDesrciptionAR FROM KitchenItems")
+                return {item_code: description for item_code, description in cursor.fetchall()}
+        except self.backend.Error as e:
+            logger.error(f"Error fetching the item catalogue: {e}")
+            self.broken = True
+            return None
+
+    def describe_lines(self, rows: List[Tuple]) -> List[Tuple]:
+        """Turn (OrderID, CreatedTime, ItemCode, Qty, Status, Section, OrderType) rows into
+        (OrderID, CreatedTime, Description, Status, (ItemCode, ItemName, Qty), (Section, OrderType)) rows.
+
+        Codes missing from the catalogue trigger one refresh on a second
+        pooled connection, since this one is busy streaming. Lines whose item
+        is still unknown are skipped, as the former join with KitchenItems did.
+        """
+        catalogue = Database._catalogue
+        missing = {row[2] for row in rows if row[2] not in catalogue} - Database._unknown_item_codes
+        if missing:
+            with Database() as catalogue_db:
+                catalogue = catalogue_db.item_catalogue(force_refresh=True)
+            Database._unknown_item_codes |= missing - catalogue.keys()
+        boards = {}  # One shared (Section, OrderType) tuple per board
+        return [
+            (
+                order_id,
+                created_time,
+                f"{catalogue[item_code]} ({format_quantity(qty)})",
+                status,
+                (item_code, catalogue[item_code], float(qty)),
+                boards.setdefault((section, order_type), (section, order_type)),
+            )
+            for order_id, created_time, item_code, qty, status, section, order_type in rows
+            if item_code in catalogue
+        ]
+
+    def sections_query(self, template: str, section_filters: Iterable[Tuple[str, str]]) -> str:
+        """Combine ``template`` for each section with UNION ALL, ordered by section and OrderID.
+
+        ``section_filters`` holds a (section, condition) pair for each select
+        to combine; a section may appear more than once.
+        """
+        order_types = ", ".join(sql_literal(order_type) for order_type in BOARD_ORDER_TYPES)
+        selects = [
+            template.format(
+                filter=order_filter,
+                section=sql_literal(section),
+                order_types=order_types,
+                created_time=self.backend.select_datetime("a.[CreatedTime]", "CreatedTime"),
+                orders_table=self.backend.qualify("kitchenOrders", section),
+                lines_table=self.backend.qualify("kitchenOrdersLines", section),
+            )
+            for section, order_filter in section_filters
+        ]
+        return "    UNION ALL".join(selects) + "    ORDER BY Section, OrderID"
+
+    def order_lines_query(self, section_filters: Dict[str, str]) -> str:
+        """Return ORDER_LINES_QUERY over the sections in ``section_filters``, each narrowed by its filter."""
+        return self.sections_query(ORDER_LINES_QUERY, section_filters.items())
+
+    def iter_orders(self, order_keys: Optional[List[Tuple[str, int]]] = None,
+                    batch_size: int = DB_FETCH_BATCH_SIZE) -> Iterator[List[Tuple]]:
+        """Stream open order lines, ordered by section and OrderID, in batches of at most ``batch_size`` rows.
 
-    def fetch_orders(self) -> List[Tuple]:
-        """Fetch all orders from the database."""
+        Streams every open order of every section, or only those with the
+        given (Section, OrderID) keys, as (OrderID, CreatedTime, Description,
+        Status, Line, Board) rows, where Board is (Section, OrderType). All
+        sections are read with one query. Rows are read with fetchmany so a
+        large backlog is never materialized at once.
+        Errors are logged and re-raised, so callers can tell a failed stream
+        from a short one.
+        """
+        if order_keys is None:
+            queries = [(self.order_lines_query({section: "" for section in DB_SECTIONS}), ())]
+        else:
+            # Stay well below SQL Server's limit of 2100 parameters per query
+            queries = []
+            for start in range(0, len(order_keys), 1000):
+                by_section = {}
+                for section, order_id in order_keys[start:start + 1000]:
+                    by_section.setdefault(section, []).append(order_id)
+                section_filters = {
+                    section: f"AND a.OrderID IN ({', '.join('?' * len(order_ids))})"
+                    for section, order_ids in by_section.items()
+                }
+                # Parameters in the order the sections appear in the query
+                params = [order_id for order_ids in by_section.values() for order_id in order_ids]
+                queries.append((self.order_lines_query(section_filters), params))
+        self.item_catalogue()  # Refreshed before the cursor is busy streaming
+        elapsed = 0.0  # Time spent in the database, excluding the consumer's work between batches
         try:
-            with self.conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT  
-                        a.OrderID,
-                        FORMAT(a.[CreatedTime], 'yyyy-MM-dd HH:mm') AS CreatedTime,
-                        c.ItemDesrciptionAR + ' (' + replace(str(b.Qty),' ','') + ')' Description,
-                        a.[Status]
-                    FROM [HotSectionDB].[dbo].[kitchenOrders] a
-                    JOIN kitchenOrdersLines b ON a.OrderID = b.OrderID
-                    JOIN KitchenItems c ON b.ItemCode = c.ItemCode
-                    WHERE a.OrderType = 'Desktop'
-                        AND a.Status IN ('Placed', 'Started', 'Ready')
-                    ORDER BY OrderID
-                """)
-                result = cursor.fetchall()
-                return result if result else []  # Return an empty list if no rows are found
-        except pyodbc.Error as e:
+            with self.cursor() as cursor:
+                for query, params in queries:
+                    start = time.perf_counter()
+                    cursor.execute(query, params)
+                    while True:
+                        batch = cursor.fetchmany(batch_size)
+                        elapsed += time.perf_counter() - start
+                        if not batch:
+                            break
+                        metrics.increment("order_lines_fetched", len(batch))
+                        yield self.describe_lines(batch)
+                        start = time.perf_counter()
+            metrics.observe("db_fetch_orders", elapsed)
+        except self.backend.Error as e:
             logger.error(f"Error fetching orders: {e}")
-            return []
+            metrics.increment("db_fetch_orders_errors")
+            self.broken = True
+            raise
+
+    def fetch_history_page(self, after: Optional[Tuple[datetime.datetime, str, int]],
+                           count: int) -> Optional[List[Tuple]]:
+        """Fetch up to ``count`` delivered orders of all sections, newest first, after a keyset cursor.
+
+        Orders delivered at the same time are listed by their section's place
+        in DB_SECTIONS, then by OrderID. ``after`` is the (DeliverdTime,
+        Section, OrderID) of the last order of the previous page, or None for
+        the first page. Each section reads its
+        own ``count`` rows past the cursor with an index seek, however far
+        back it is, and the sections are merged into the page. Returns
+        (Section, OrderID, CreatedTime, DeliverdTime, Description) rows, or
+        None if the query failed.
+        """
+        top, limit = self.backend.limit_clause(count)
+        selects, params = [], []
+        for rank, section in enumerate(DB_SECTIONS):
+            if after is None:
+                after_filter = ""
+            elif rank == DB_SECTIONS.index(after[1]):
+                after_filter = "AND (a.DeliverdTime < ? OR (a.DeliverdTime = ? AND a.OrderID < ?))"
+                params += [after[0], after[0], after[2]]
+            else:
+                # Sections ranked after the cursor's still list orders delivered at the cursor's time
+                after_filter = "AND a.DeliverdTime <= ?" if rank > DB_SECTIONS.index(after[1]) else "AND a.DeliverdTime < ?"
+                params.append(after[0])
+            section_query = HISTORY_QUERY.format(
+                top=top,
+                limit=limit,
+                section=sql_literal(section),
+                created_time=self.backend.select_datetime("a.[CreatedTime]", "CreatedTime"),
+                delivered_time=self.backend.select_datetime("a.[DeliverdTime]", "DeliverdTime"),
+                orders_table=self.backend.qualify("kitchenOrders", section),
+                order_types=", ".join(sql_literal(order_type) for order_type in BOARD_ORDER_TYPES),
+                after=after_filter,
+            )
+            selects.append(f"SELECT * FROM ({section_query}) s{rank}")
+        try:
+            catalogue = self.item_catalogue()
+            with timed("db_fetch_history"), self.cursor() as cursor:
+                cursor.execute("\n    UNION ALL\n".join(selects), params)
+                orders = sorted(
+                    cursor.fetchall(),
+                    key=lambda order: (order[3], -DB_SECTIONS.index(order[0]), order[1]),
+                    reverse=True,
+                )[:count]
+                lines = {}
+                for section in DB_SECTIONS:
+                    order_ids = [order_id for order_section, order_id, *_ in orders if order_section == section]
+                    if not order_ids:
+                        continue
+                    placeholders = ", ".join("?" * len(order_ids))
+                    cursor.execute(
+                        f"SELECT b.OrderID, b.ItemCode, b.Qty FROM {self.backend.qualify('kitchenOrdersLines', section)} b "
+                        f"WHERE b.OrderID IN ({placeholders})",
+                        order_ids,
+                    )
+                    for order_id, item_code, qty in cursor.fetchall():
+                        if item_code in catalogue:  # Unknown items are skipped, as on the board
+                            lines.setdefault((section, order_id), []).append(
+                                f"{catalogue[item_code]} ({format_quantity(qty)})"
+                            )
+            return [
+                (section, order_id, created_time, delivered_time, "\n".join(lines.get((section, order_id), ())))
+                for section, order_id, created_time, delivered_time in orders
+            ]
+        except self.backend.Error as e:
+            logger.error(f"Error fetching order history: {e}")
+            self.broken = True
+            return None
+
+    def fetch_server_time(self) -> Optional[datetime.datetime]:
+        """Return the database server's current time, used as a sync watermark."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(self.backend.server_time_sql)
+                return cursor.fetchone()[0]
+        except self.backend.Error as e:
+            logger.error(f"Error fetching server time: {e}")
+            self.broken = True
+            return None
 
-    def fetch_new_orders(self, max_order_id: int) -> List[Tuple]:
-        """Fetch orders with OrderID greater than the specified value."""
+    def fetch_order_changes(self, since: datetime.datetime) -> Tuple[List[Tuple], Optional[datetime.datetime]]:
+        """Fetch the headers of orders created or moved to a new status since a watermark.
+
+        Returns (OrderID, Status, Section, OrderType) rows for orders of any
+        status in every section, read with one query, so closed orders are
+        reported as well, together with the server time the query started
+        at, which is the watermark for the next call.
+        """
         try:
-            with self.conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT  
-                        a.OrderID,
-                        FORMAT(a.[CreatedTime], 'yyyy-MM-dd HH:mm') AS CreatedTime,
-                        c.ItemDesrciptionAR + ' (' + replace(str(b.Qty),' ','') + ')' Description,
-                        a.[Status]
-                    FROM [HotSectionDB].[dbo].[kitchenOrders] a
-                    JOIN kitchenOrdersLines b ON a.OrderID = b.OrderID
-                    JOIN KitchenItems c ON b.ItemCode = c.ItemCode
-                    WHERE a.OrderType = 'Desktop'
-                        AND a.Status IN ('Placed', 'Started', 'Ready')
-                        AND a.OrderID > ?
-                    ORDER BY OrderID
-                """, (max_order_id,))
-                result = cursor.fetchall()
-                return result if result else []  # Return an empty list if no rows are found
-        except pyodbc.Error as e:
-            logger.error(f"Error fetching new orders: {e}")
-            return []
-
-    def update_status(self, order_id: int, new_status: str) -> bool:
-        """Update the status and timestamp fields of an order in the database."""
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Correct datetime format
+            with timed("db_fetch_changes"), self.cursor() as cursor:
+                cursor.execute(self.backend.server_time_sql)
+                server_time = cursor.fetchone()[0]
+                # One range seek per indexed marker column; an OR across them would scan the whole table
+                section_filters = [
+                    (section, f"AND a.{column} >= ?") for section in DB_SECTIONS for column in self.change_markers(section)
+                ]
+                cursor.execute(self.sections_query(ORDER_CHANGES_QUERY, section_filters), [since] * len(section_filters))
+                # An order stamped in several marker columns is read once per column
+                rows = list({(row[2], row[0]): row for row in cursor.fetchall()}.values())
+                metrics.increment("order_changes_fetched", len(rows))
+                return rows, server_time
+        except self.backend.Error as e:
+            logger.error(f"Error fetching order changes: {e}")
+            self.broken = True
+            return [], None
+
+    def update_statuses(self, transitions: Dict[int, List[Tuple[str, str]]],
+                        section: str = HOME_SECTION) -> Dict[int, Optional[str]]:
+        """Apply status transitions for several orders of one section in a single transaction.
+
+        ``transitions`` maps each OrderID to its (status, timestamp) steps in
+        the order they happened. Steps for one order are coalesced into one
+        row of a parameterized UPDATE that sets the final status and the
+        timestamp of every step. Orders needing the same statement are sent
+        together with executemany, so a batch costs a few round-trips rather
+        than one per order.
+        Updates only move an order forward, so replaying a transition that is
+        already applied, or overtaken by another station, changes nothing;
+        the statuses are read back, and an overtaken transition is reported as
+        "Overtaken by <status>." Returns a dict mapping each OrderID to None
+        on success or the reason the database rejected it. Database errors roll back and are re-raised,
+        so the caller can retry the whole batch.
+        """
+        orders_table = self.backend.qualify("kitchenOrders", section)
+        results = {}
+        statements = {}  # (status, timestamp columns) -> parameter rows for one UPDATE
+        for order_id, steps in transitions.items():
+            # Determine which timestamp fields to update based on the new statuses
+            invalid = [status for status, _ in steps if status not in STATUS_TIME_COLUMNS]
+            if invalid:
+                logger.error(f"Invalid status: {invalid[0]}")
+                results[order_id] = f"Invalid status: {invalid[0]}"
+                continue
+            timestamps = {STATUS_TIME_COLUMNS[status]: timestamp for status, timestamp in steps}
+            new_status = steps[-1][0]
+            earlier = STATUS_SEQUENCE[:STATUS_SEQUENCE.index(new_status)]
+            statements.setdefault((new_status, tuple(timestamps)), []).append(
+                (new_status, *timestamps.values(), order_id, *earlier)
+            )
+            results[order_id] = None
         try:
-            with self.conn.cursor() as cursor:
-                # Determine which timestamp field to update based on the new status
-                if new_status == "Started":
-                    query = "UPDATE kitchenOrders SET status = ?, StartedTime = ? WHERE OrderID = ?"
-                elif new_status == "Ready":
-                    query = "UPDATE kitchenOrders SET status = ?, ReadyTime = ? WHERE OrderID = ?"
-                elif new_status == "Delivered":
-                    query = "UPDATE kitchenOrders SET status = ?, DeliverdTime = ? WHERE OrderID = ?"
-                else:
-                    logger.error(f"Invalid status: {new_status}")
-                    return False
-
-                # Execute the query
-                logger.info(f"Executing query: {query} with values: ({new_status}, {timestamp}, {order_id})")
-                cursor.execute(query, (new_status, timestamp, order_id))
+            with timed("db_update_statuses"), self.cursor() as cursor:
+                # The status times keep when the cook tapped; LastModified marks when the write
+                # reached the server, so a tap flushed late from the journal is still seen by delta syncs
+                last_modified = f", LastModified = {self.backend.now_sql}" if self.has_last_modified(section) else ""
+                for (new_status, columns), rows in statements.items():
+                    earlier = STATUS_SEQUENCE[:STATUS_SEQUENCE.index(new_status)]
+                    assignments = "".join(f", {column} = ?" for column in columns)
+                    placeholders = ", ".join("?" * len(earlier))
+                    query = (
+                        f"UPDATE {orders_table} SET status = ?{last_modified}{assignments} "
+                        f"WHERE OrderID = ? AND Status IN ({placeholders})"
+                    )
+                    logger.info(f"Executing query: {query} for {len(rows)} orders")
+                    self.backend.executemany(cursor, query, rows)
+
+                # Read the statuses back: an order the UPDATE did not match is missing, already
+                # at the status (a replayed write) or overtaken by another station
+                written = {order_id: steps[-1][0] for order_id, steps in transitions.items() if results[order_id] is None}
+                order_ids = list(written)
+                for start in range(0, len(order_ids), 1000):
+                    chunk = order_ids[start:start + 1000]
+                    cursor.execute(
+                        f"SELECT OrderID, Status FROM {orders_table} WHERE OrderID IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    statuses = {order_id: status.strip() for order_id, status in cursor.fetchall()}
+                    for order_id in chunk:
+                        status = statuses.get(order_id)
+                        if status is None:
+                            results[order_id] = f"Order {order_id} was not found."
+                        elif status != written[order_id]:
+                            results[order_id] = f"Overtaken by {status}."
                 self.conn.commit()
-                logger.info(f"Status and timestamp updated for Order ID {order_id} to {new_status}.")
-                return True
-        except pyodbc.Error as e:
-            logger.error(f"Error updating status for Order ID {order_id}: {e}")
-            self.conn.rollback()  # Rollback in case of error
-            return False
+                committed = sum(r is None for r in results.values())
+                metrics.increment("status_updates_committed", committed)
+                logger.info(f"Status and timestamp updated for {committed} orders.")
+                return results
+        except self.backend.Error as e:
+            logger.error(f"Error updating status for Order IDs {list(transitions)}: {e}")
+            try:
+                self.conn.rollback()  # Rollback in case of error
+            except self.backend.Error:
+                self.broken = True
+            if self.backend.is_connectivity_error(e):
+                self.broken = True
+            raise
 
     def close(self):
-        """Close the database connection."""
-        try:
-            if self.conn and not self.conn.closed:
-                self.conn.close()
-                logger.info("Database connection closed.")
-        except pyodbc.Error as e:
-            logger.error(f"Error closing the database connection: {e}")
+        """Return the connection to the pool, discarding it if it failed."""
+        if self.conn is not None:
+            self.pool().release(self.conn, discard=self.broken)
+            self.conn = None
 
     def __enter__(self):
         """Support for context manager (with statement)."""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Ensure the connection is closed when exiting the context."""
+        """Ensure the connection is returned when exiting the context."""
         self.close()
\ No newline at end of file
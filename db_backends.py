@@ -0,0 +1,198 @@
+# db_backends.py
+"""Database backends for Database: the SQL Server production database and a SQLite stand-in.
+
+A backend opens connections and supplies the few pieces of SQL that differ
+between dialects. The SQLite backend has the same kitchenOrders,
+kitchenOrdersLines and KitchenItems schema, so the whole application can run
+without SQL Server, e.g. for benchmarks and local development.
+"""
+from contextlib import closing
+from decouple import Csv, config
+import datetime
+import logging
+import os
+import sqlite3
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DB_BACKEND = config("DB_BACKEND", default="odbc")                   # odbc or sqlite
+DB_SQLITE_PATH = config("DB_SQLITE_PATH", default="kitchen.db")     # Database file of the sqlite backend
+# Kitchen section databases shown on the boards; the first one also holds the item catalogue
+DB_SECTIONS = config("DB_SECTIONS", default="HotSectionDB", cast=Csv())
+HOME_SECTION = DB_SECTIONS[0]
+
+
+class OdbcBackend:
+    """SQL Server through pyodbc and the ODBC Driver 17."""
+    name = "odbc"
+    server_time_sql = "SELECT GETDATE()"
+    now_sql = "GETDATE()"  # Server time inside a statement, for the LastModified change marker
+    catalogue_version_sql = "SELECT CHECKSUM_AGG(BINARY_CHECKSUM(ItemCode, ItemDesrciptionAR)) FROM KitchenItems"
+
+    def __init__(self):
+        import pyodbc  # Only needed when SQL Server is actually used
+        self.pyodbc = pyodbc
+        self.Error = pyodbc.Error
+        # Load database credentials from environment variables
+        self.DB_SERVER = config("DB_SERVER")
+        self.DB_NAME = config("DB_NAME")
+        self.DB_USER = config("DB_USER")
+        self.DB_PASSWORD = config("DB_PASSWORD")
+
+    def connect(self):
+        return self.pyodbc.connect(
+            Driver="{ODBC Driver 17 for SQL Server}",
+            Server=self.DB_SERVER,
+            Database=self.DB_NAME,
+            uid=self.DB_USER,
+            pwd=self.DB_PASSWORD,
+            timeout=30,  # Add a connection timeout
+        )
+
+    @staticmethod
+    def cursor(conn):
+        """Return a cursor usable in a with statement."""
+        return conn.cursor()
+
+    @staticmethod
+    def is_closed(conn) -> bool:
+        return conn.closed
+
+    def is_connectivity_error(self, error) -> bool:
+        """True for errors worth retrying later (lost connection, timeout), as opposed to rejected statements."""
+        return isinstance(error, (self.pyodbc.OperationalError, self.pyodbc.InterfaceError))
+
+    @staticmethod
+    def executemany(cursor, query: str, rows: list):
+        """Run one statement for many parameter rows, sent to the server as a single array."""
+        cursor.fast_executemany = True
+        cursor.executemany(query, rows)
+
+    @staticmethod
+    def qualify(table: str, section: str = HOME_SECTION) -> str:
+        """Return the fully qualified name of a kitchen table in a section's database."""
+        return f"[{section}].[dbo].[{table}]"
+
+    def column_exists_sql(self, table: str, column: str, section: str = HOME_SECTION) -> str:
+        """Return a query whose single value is non-null when a section's table has the column."""
+        return f"SELECT COL_LENGTH(N'{self.qualify(table, section)}', '{column}')"
+
+    @staticmethod
+    def select_datetime(column: str, alias: str) -> str:
+        """Return a select-list item that reads a datetime column as a Python datetime."""
+        return f"{column} AS {alias}"
+
+    @staticmethod
+    def limit_clause(count: int):
+        """Return the (after SELECT, after ORDER BY) parts that keep the first ``count`` rows."""
+        return f"TOP ({int(count)})", ""
+
+
+def parse_datetime(value: bytes) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.decode())
+
+
+class SqliteBackend:
+    """A SQLite file with the kitchen schema, standing in for SQL Server."""
+    name = "sqlite"
+    Error = sqlite3.Error
+    server_time_sql = "SELECT datetime('now', 'localtime') AS \"now [datetime]\""
+    now_sql = "datetime('now', 'localtime')"
+    catalogue_version_sql = "SELECT COUNT(*) * 1000003 + TOTAL(LENGTH(ItemCode || ItemDesrciptionAR)) FROM KitchenItems"
+    schema = """
+        CREATE TABLE IF NOT EXISTS kitchenOrders (
+            OrderID INTEGER PRIMARY KEY,
+            OrderType TEXT NOT NULL DEFAULT 'Desktop',
+            Status TEXT NOT NULL DEFAULT 'Placed',
+            CreatedTime TEXT NOT NULL,
+            StartedTime TEXT,
+            ReadyTime TEXT,
+            DeliverdTime TEXT,
+            LastModified TEXT
+        );
+        CREATE TABLE IF NOT EXISTS kitchenOrdersLines (
+            OrderID INTEGER NOT NULL,
+            ItemCode INTEGER NOT NULL,
+            Qty REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS kitchenOrdersLines_OrderID ON kitchenOrdersLines (OrderID);
+        CREATE INDEX IF NOT EXISTS kitchenOrders_DeliverdTime ON kitchenOrders (DeliverdTime, OrderID);
+        CREATE INDEX IF NOT EXISTS kitchenOrders_CreatedTime ON kitchenOrders (CreatedTime);
+        CREATE INDEX IF NOT EXISTS kitchenOrders_StartedTime ON kitchenOrders (StartedTime);
+        CREATE INDEX IF NOT EXISTS kitchenOrders_ReadyTime ON kitchenOrders (ReadyTime);
+        CREATE INDEX IF NOT EXISTS kitchenOrders_LastModified ON kitchenOrders (LastModified);
+        CREATE TABLE IF NOT EXISTS KitchenItems (
+            ItemCode INTEGER PRIMARY KEY,
+            ItemDesrciptionAR TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = DB_SQLITE_PATH, sections=DB_SECTIONS):
+        self.path = path
+        self.sections = sections  # The home section is the main file; the others are attached next to it
+        sqlite3.register_converter("datetime", parse_datetime)
+        # Stored like SQL Server's default string conversion, so text comparisons order correctly
+        sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+
+    def connect(self):
+        # Pooled connections move between the worker threads, one borrower at a time
+        conn = sqlite3.connect(self.path, timeout=30, detect_types=sqlite3.PARSE_COLNAMES, check_same_thread=False)
+        conn.executescript(self.schema)
+        for section in self.sections:
+            if section != HOME_SECTION:
+                conn.execute("ATTACH DATABASE ? AS ?", (self.section_path(section), section))
+                conn.executescript(self.schema.replace("IF NOT EXISTS ", f"IF NOT EXISTS [{section}]."))
+        return conn
+
+    def section_path(self, section: str) -> str:
+        """Return the file of a section other than the home section."""
+        return os.path.join(os.path.dirname(self.path), f"{section}.db")
+
+    @staticmethod
+    def cursor(conn):
+        """Return a cursor usable in a with statement."""
+        return closing(conn.cursor())
+
+    @staticmethod
+    def is_closed(conn) -> bool:
+        try:
+            conn.total_changes
+            return False
+        except sqlite3.ProgrammingError:
+            return True
+
+    @staticmethod
+    def is_connectivity_error(error) -> bool:
+        return isinstance(error, (sqlite3.OperationalError, sqlite3.InterfaceError))  # e.g. database is locked
+
+    @staticmethod
+    def executemany(cursor, query: str, rows: list):
+        cursor.executemany(query, rows)
+
+    @staticmethod
+    def qualify(table: str, section: str = HOME_SECTION) -> str:
+        return f"[{table}]" if section == HOME_SECTION else f"[{section}].[{table}]"
+
+    @staticmethod
+    def column_exists_sql(table: str, column: str, section: str = HOME_SECTION) -> str:
+        schema = "main" if section == HOME_SECTION else section
+        return f"SELECT MAX(name) FROM pragma_table_info('{table}', '{schema}') WHERE name = '{column}'"
+
+    @staticmethod
+    def select_datetime(column: str, alias: str) -> str:
+        return f'{column} AS "{alias} [datetime]"'  # Converted by parse_datetime
+
+    @staticmethod
+    def limit_clause(count: int):
+        return "", f"LIMIT {int(count)}"
+
+
+def create_backend(name: str = DB_BACKEND):
+    """Create the backend selected by DB_BACKEND."""
+    if name == "sqlite":
+        return SqliteBackend()
+    if name == "odbc":
+        return OdbcBackend()
+    raise ValueError(f"Unknown database backend: {name}")
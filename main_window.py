@@ -1,51 +1,169 @@
 # main_window.py
 import sys
-from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
-from order_table_widget import OrderTableWidget
-from database_connection import Database
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QSplitter, QTabWidget, QVBoxLayout, QWidget
+from decouple import config
+from metrics import metrics
+from startup_profiler import PROFILE_STARTUP, profiler
+
+METRICS_OVERLAY = config("METRICS_OVERLAY", default=False, cast=bool)  # Show the metrics overlay at startup
+METRICS_OVERLAY_KEY = config("METRICS_OVERLAY_KEY", default="F12")     # Shortcut that toggles the overlay
+PREP_LIST_PANEL = config("PREP_LIST_PANEL", default=True, cast=bool)    # Show the prep list beside the board
+STARTUP_PROFILE_TIMEOUT = 120  # Seconds --profile-startup waits for the first poll before reporting anyway
+
+
+class FirstPaintWatcher(QObject):
+    """Calls back once, on the event loop pass after a widget is first painted."""
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            QTimer.singleShot(0, self.callback)
+            self.deleteLater()
+        return False
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Pizza Orders")
         self.setGeometry(100, 100, 1200, 800)
+        self.order_sync = None
+        self.history_panel = None
+        self.order_tables = []
 
-        # Initialize database connection and fetch grouped orders
-        self.db = Database()
-        self.grouped_orders = self.fetch_and_group_orders()
-        self.db.close()  # Close the connection after fetching data
-
-        # Initialize UI
+        # Initialize UI: an empty shell first; the boards are built once it is on screen
         self.initUI()
 
-    def fetch_and_group_orders(self):
-        """Fetch orders from the database and group them by OrderID."""
-        try:
-            orders = self.db.fetch_orders()
-            grouped = {}
-            for order in orders:
-                order_id, created_time, description, status = order
-                if order_id not in grouped:
-                    grouped[order_id] = {
-                        "OrderID": order_id,
-                        "CreatedTime": created_time,
-                        "Description": [],
-                        "Status": status,
-                    }
-                grouped[order_id]["Description"].append(description)
-            return grouped
-        except Exception as e:
-            print(f"Error fetching orders: {e}")
-            return {}
-
     def initUI(self):
-        """Initialize the main UI."""
+        """Initialize the window shell; load_boards fills it after the first paint."""
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout()
 
-        # Create and add the order table widget
-        self.order_table = OrderTableWidget(self.grouped_orders)
-        layout.addWidget(self.order_table)
+        self.tabs = QTabWidget()
+        self.loading_label = QLabel("Loading orders…")
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.tabs.addTab(self.loading_label, "Board")
+        layout.addWidget(self.tabs)
 
         central_widget.setLayout(layout)
+
+        # Debug overlay with live timings, toggled with METRICS_OVERLAY_KEY
+        self.metrics_overlay = QLabel(central_widget)
+        self.metrics_overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.metrics_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 180); color: #9eff9e; font-family: monospace; font-size: 12px; padding: 8px;"
+        )
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(1000)
+        self.metrics_timer.timeout.connect(self.refresh_metrics_overlay)
+        QShortcut(QKeySequence(METRICS_OVERLAY_KEY), self, activated=self.toggle_metrics_overlay)
+        self.metrics_overlay.setVisible(METRICS_OVERLAY)
+        if METRICS_OVERLAY:
+            self.metrics_timer.start()
+
+        FirstPaintWatcher(self.tabs, self.load_boards)
+
+    def load_boards(self):
+        """Build the board tabs from the local snapshot, then start syncing after they are painted."""
+        profiler.milestone("shell painted")
+        # Imported here so the shell is on screen before the database and table modules load
+        with profiler.phase("board imports"):
+            from database_connection import BOARD_ORDER_TYPES, DB_SECTIONS
+            from order_history import HistoryPanel
+            from order_snapshot import OrderSnapshot
+            from order_sync import OrderSync
+            from order_table_widget import OrderTableWidget
+            from prep_list import PrepListPanel
+
+        # Render the last known orders from the local snapshot; the database
+        # worker reconciles them with the live database in the background
+        with profiler.phase("snapshot load"):
+            self.snapshot = OrderSnapshot()
+            orders, watermark = self.snapshot.load()
+
+        # One board tab per section and order type, each with its prep list beside it.
+        # A single OrderSync polls for all of them and routes the changes
+        with profiler.phase("table build"):
+            self.order_sync = OrderSync(orders, watermark, self.snapshot, parent=self)
+            self.tabs.setUpdatesEnabled(False)
+            self.tabs.removeTab(0)
+            self.loading_label.deleteLater()
+            boards = [(section, order_type) for section in DB_SECTIONS for order_type in BOARD_ORDER_TYPES]
+            for section, order_type in boards:
+                order_table = OrderTableWidget(
+                    self.order_sync.board_orders(section, order_type), self.order_sync.status_writer, section, order_type
+                )
+                self.order_sync.add_board(order_table)
+                self.order_tables.append(order_table)
+                splitter = QSplitter()
+                splitter.addWidget(order_table)
+                if PREP_LIST_PANEL:
+                    splitter.addWidget(PrepListPanel(order_table.model.store))
+                    splitter.setSizes([900, 300])
+                self.tabs.addTab(splitter, f"{section} · {order_type}" if len(boards) > 1 else "Board")
+
+            # Delivered orders leave the board; the history tab lists them, loading as it scrolls
+            self.history_panel = HistoryPanel()
+            self.tabs.addTab(self.history_panel, "History")
+            self.tabs.setUpdatesEnabled(True)
+        FirstPaintWatcher(self.tabs.currentWidget(), self.start_sync)
+
+    def start_sync(self):
+        """Start the database worker once the boards are on screen."""
+        profiler.milestone("boards painted")
+        self.order_sync.start()
+        if PROFILE_STARTUP:
+            self.profile_deadline = profiler.elapsed() + STARTUP_PROFILE_TIMEOUT
+            self.profile_timer = QTimer(self)
+            self.profile_timer.setInterval(50)
+            self.profile_timer.timeout.connect(self.check_first_poll)
+            self.profile_timer.start()
+
+    def check_first_poll(self):
+        """For --profile-startup: report and exit once the first poll has reached the boards."""
+        polls, _ = metrics.totals("poll_cycle")
+        if not polls and profiler.elapsed() < self.profile_deadline:
+            return
+        self.profile_timer.stop()
+        profiler.milestone("first poll shown" if polls else "first poll timed out")
+        # The worker thread's phases, from the metrics it records
+        for phase, names in (
+            ("db connect", ("db_connect",)),
+            ("db query", ("db_fetch_orders", "db_fetch_changes")),
+            ("grouping", ("group_rows",)),
+            ("table update", ("table_update",)),
+        ):
+            profiler.record(phase, sum(metrics.totals(name)[1] for name in names))
+        profiler.write_report()
+        self.close()
+
+    def closeEvent(self, event):
+        """Stop the order sync and the history loader with the window."""
+        if self.order_sync is not None:
+            self.order_sync.stop()
+        if self.history_panel is not None:
+            self.history_panel.stop()
+        super().closeEvent(event)
+
+    def toggle_metrics_overlay(self):
+        """Show or hide the metrics overlay."""
+        visible = not self.metrics_overlay.isVisible()
+        self.metrics_overlay.setVisible(visible)
+        if visible:
+            self.refresh_metrics_overlay()
+            self.metrics_timer.start()
+        else:
+            self.metrics_timer.stop()
+
+    def refresh_metrics_overlay(self):
+        """Redraw the overlay with the current metrics."""
+        self.metrics_overlay.setText("\n".join(metrics.summary_lines()) or "No metrics recorded yet.")
+        self.metrics_overlay.adjustSize()
+        self.metrics_overlay.raise_()
@@ -0,0 +1,207 @@
+# metrics.py
+"""Timing histograms and counters for the board's hot paths.
+
+Instrumented code records into the shared ``metrics`` registry:
+    with timed("db_connect"):   # Duration histogram, plus db_connect_errors on exceptions
+        ...
+    metrics.increment("order_lines_fetched", len(rows))
+
+start_metrics_export() writes periodic summaries to a rotating local file and,
+when METRICS_PORT is set, serves them as Prometheus text on localhost.
+"""
+from collections import deque
+from contextlib import contextmanager
+from decouple import config
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+import json
+import logging
+import os
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+METRICS_WINDOW = config("METRICS_WINDOW", default=1024, cast=int)        # Recent samples kept per histogram
+METRICS_INTERVAL = config("METRICS_INTERVAL", default=60, cast=int)      # Seconds between file exports
+METRICS_FILE = config(
+    "METRICS_FILE",
+    default=os.path.join(os.getenv("LOCALAPPDATA", os.path.expanduser("~")), "ChiefView", "metrics.log"),
+)
+METRICS_FILE_MAX_BYTES = config("METRICS_FILE_MAX_BYTES", default=1_000_000, cast=int)
+METRICS_FILE_BACKUPS = config("METRICS_FILE_BACKUPS", default=3, cast=int)
+METRICS_PORT = config("METRICS_PORT", default=0, cast=int)  # Prometheus text endpoint on localhost; 0 disables it
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Durations in seconds: lifetime count and sum, percentiles over the most recent samples."""
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, quantile: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+
+class MetricsRegistry:
+    """Thread-safe set of named histograms and counters."""
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def totals(self, name: str) -> tuple:
+        """Return the lifetime (count, sum in seconds) of a histogram."""
+        with self.lock:
+            histogram = self.histograms.get(name)
+            return (histogram.count, histogram.total) if histogram is not None else (0, 0.0)
+
+    def snapshot(self) -> dict:
+        """Return the current histogram summaries (in milliseconds) and counters."""
+        with self.lock:
+            histograms = {
+                name: {
+                    "count": histogram.count,
+                    **{f"p{int(q * 100)}_ms": round(histogram.percentile(q) * 1000, 2) for q in QUANTILES},
+                }
+                for name, histogram in sorted(self.histograms.items())
+            }
+            return {"histograms": histograms, "counters": dict(sorted(self.counters.items()))}
+
+    def summary_lines(self) -> list:
+        """Return one readable line per metric, for the on-screen overlay."""
+        snapshot = self.snapshot()
+        lines = [
+            f"{name}: p50 {s['p50_ms']:.1f} / p95 {s['p95_ms']:.1f} / p99 {s['p99_ms']:.1f} ms (n={s['count']})"
+            for name, s in snapshot["histograms"].items()
+        ]
+        lines += [f"{name}: {value}" for name, value in snapshot["counters"].items()]
+        return lines
+
+    def prometheus_text(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        out = []
+        with self.lock:
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"chiefview_{name}_seconds"
+                out.append(f"# TYPE {metric} summary")
+                for quantile in QUANTILES:
+                    out.append(f'{metric}{{quantile="{quantile}"}} {histogram.percentile(quantile):.6f}')
+                out.append(f"{metric}_sum {histogram.total:.6f}")
+                out.append(f"{metric}_count {histogram.count}")
+            for name, value in sorted(self.counters.items()):
+                out.append(f"# TYPE chiefview_{name}_total counter")
+                out.append(f"chiefview_{name}_total {value}")
+        return "\n".join(out) + "\n"
+
+
+metrics = MetricsRegistry()  # Shared by every module
+
+
+@contextmanager
+def timed(name: str):
+    """Record the duration of a block in the ``name`` histogram and count failures as ``name_errors``."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        metrics.increment(f"{name}_errors")
+        raise
+    finally:
+        metrics.observe(name, time.perf_counter() - start)
+
+
+class MetricsFileExporter(threading.Thread):
+    """Appends a JSON summary of the metrics to a rotating file at a fixed interval."""
+    def __init__(self, path: str = METRICS_FILE, interval: float = METRICS_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handler = RotatingFileHandler(
+            path, maxBytes=METRICS_FILE_MAX_BYTES, backupCount=METRICS_FILE_BACKUPS, encoding="utf-8"
+        )
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.export()
+
+    def export(self):
+        record = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), **metrics.snapshot()}
+        self.handler.emit(logging.makeLogRecord({"msg": json.dumps(record), "levelno": logging.INFO}))
+
+    def stop(self):
+        """Stop exporting after writing a final summary."""
+        self.stopped.set()
+        self.export()
+        self.handler.close()
+
+
+class PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes are not worth a log line each
+
+
+class MetricsExport:
+    """The running exporters; stop() shuts them down."""
+    def __init__(self, file_exporter, http_server):
+        self.file_exporter = file_exporter
+        self.http_server = http_server
+
+    def stop(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+        if self.file_exporter is not None:
+            self.file_exporter.stop()
+
+
+def start_metrics_export(port: int = METRICS_PORT) -> MetricsExport:
+    """Start the rotating file exporter and, if ``port`` is set, the Prometheus endpoint."""
+    file_exporter = http_server = None
+    try:
+        file_exporter = MetricsFileExporter()
+        file_exporter.start()
+    except OSError as e:
+        logger.error(f"Error opening the metrics file: {e}")
+    if port:
+        try:
+            http_server = ThreadingHTTPServer(("127.0.0.1", port), PrometheusHandler)
+            threading.Thread(target=http_server.serve_forever, daemon=True).start()
+            logger.info(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+        except OSError as e:
+            logger.error(f"Error starting the metrics endpoint on port {port}: {e}")
+    return MetricsExport(file_exporter, http_server)
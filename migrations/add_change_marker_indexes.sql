@@ -0,0 +1,25 @@
+-- migrations/add_change_marker_indexes.sql
+-- Indexes the status time columns delta syncs search for changes, so each
+-- becomes a range seek instead of a scan of kitchenOrders.
+-- Run by a DBA outside service hours, once per section in DB_SECTIONS, e.g.
+--     sqlcmd -S <server> -v SectionDB=HotSectionDB -i migrations/add_change_marker_indexes.sql
+-- The DeliverdTime index also serves the history tab's keyset pages.
+
+USE [$(SectionDB)];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'kitchenOrders_CreatedTime' AND object_id = OBJECT_ID(N'dbo.kitchenOrders'))
+    CREATE INDEX kitchenOrders_CreatedTime ON dbo.kitchenOrders (CreatedTime);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'kitchenOrders_StartedTime' AND object_id = OBJECT_ID(N'dbo.kitchenOrders'))
+    CREATE INDEX kitchenOrders_StartedTime ON dbo.kitchenOrders (StartedTime);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'kitchenOrders_ReadyTime' AND object_id = OBJECT_ID(N'dbo.kitchenOrders'))
+    CREATE INDEX kitchenOrders_ReadyTime ON dbo.kitchenOrders (ReadyTime);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'kitchenOrders_DeliverdTime' AND object_id = OBJECT_ID(N'dbo.kitchenOrders'))
+    CREATE INDEX kitchenOrders_DeliverdTime ON dbo.kitchenOrders (DeliverdTime, OrderID);
+GO
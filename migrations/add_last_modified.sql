@@ -0,0 +1,17 @@
+-- migrations/add_last_modified.sql
+-- Adds the LastModified change marker to one kitchen section database.
+-- Run by a DBA outside service hours, once per section in DB_SECTIONS, e.g.
+--     sqlcmd -S <server> -v SectionDB=HotSectionDB -i migrations/add_last_modified.sql
+-- The app checks for the column at startup and stamps it on every status
+-- write; without it, delta syncs find changes by the status time columns only.
+
+USE [$(SectionDB)];
+GO
+
+IF COL_LENGTH(N'dbo.kitchenOrders', 'LastModified') IS NULL
+    ALTER TABLE dbo.kitchenOrders ADD LastModified DATETIME NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'kitchenOrders_LastModified' AND object_id = OBJECT_ID(N'dbo.kitchenOrders'))
+    CREATE INDEX kitchenOrders_LastModified ON dbo.kitchenOrders (LastModified);
+GO
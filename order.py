@@ -1,6 +1,8 @@
 # order.py
 class Order:
-    """Represents a single order."""
+    """Represents a single order line."""
+    __slots__ = ("order_id", "created_time", "description", "status")
+
     def __init__(self, order_id, created_time, description, status):
         self.order_id = order_id
         self.created_time = created_time
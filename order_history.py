@@ -0,0 +1,243 @@
+# order_history.py
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from PyQt6.QtWidgets import QHBoxLayout, QHeaderView, QLabel, QPushButton, QTableView, QVBoxLayout, QWidget
+from decouple import config
+from database_connection import DB_SECTIONS, Database
+from order_table_model import cached_font
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HISTORY_PAGE_SIZE = config("HISTORY_PAGE_SIZE", default=100, cast=int)      # Delivered orders per query
+HISTORY_CACHE_PAGES = config("HISTORY_CACHE_PAGES", default=20, cast=int)   # Pages kept in memory
+
+# The section column is only shown when orders come from several sections
+HISTORY_COLUMN_HEADERS = (
+    ["Order No"] + (["Section"] if len(DB_SECTIONS) > 1 else []) + ["Order Time", "Delivered", "Description"]
+)
+
+
+class HistoryWorker(QThread):
+    """Loads history pages in the background, most recently requested first."""
+    page_loaded = pyqtSignal(int, int, list)  # Generation, page, (Section, OrderID, CreatedTime, DeliverdTime, Description) rows
+    page_failed = pyqtSignal(int, int)        # Generation, page
+
+    def __init__(self):
+        super().__init__()
+        self.condition = threading.Condition()
+        self.requests = []  # (generation, page, cursor); the newest request is served first
+        self.running = True
+
+    def request(self, generation, page, cursor):
+        with self.condition:
+            self.requests.append((generation, page, cursor))
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.requests:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                generation, page, cursor = self.requests.pop()  # Rows on screen now matter more than skipped ones
+            try:
+                with Database() as db:
+                    rows = db.fetch_history_page(cursor, HISTORY_PAGE_SIZE)
+            except Exception as e:
+                logger.error(f"Error loading order history: {e}")
+                rows = None
+            if rows is None:
+                self.page_failed.emit(generation, page)
+            else:
+                self.page_loaded.emit(generation, page, rows)
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """Delivered orders of all sections, newest first, loaded a page at a time.
+
+    Pages are fetched with keyset pagination: the cursor of each page is the
+    (DeliverdTime, Section, OrderID) of the last order of the page before it, which is
+    all that is kept for pages that are not in memory. New pages are added
+    as the view scrolls to the end (fetchMore); only the HISTORY_CACHE_PAGES
+    most recently used pages are held, and an evicted page is loaded again
+    from its cursor when its rows come back into view.
+    """
+    page_requested = pyqtSignal(int, int, object)  # Generation, page, cursor
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0        # Bumped by reset, so late pages of an earlier listing are dropped
+        self.active = False        # Nothing is fetched until the history is first shown
+        self.cursors = [None]      # Page -> cursor it starts after
+        self.page_count = 0        # Pages listed so far
+        self.row_total = 0
+        self.at_end = False
+        self.pages = OrderedDict()  # Page -> rows, least recently used first
+        self.pending = set()        # Pages requested and not yet loaded
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_total
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HISTORY_COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HISTORY_COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.FontRole:
+            return cached_font(12)
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        page, offset = divmod(index.row(), HISTORY_PAGE_SIZE)
+        rows = self.pages.get(page)
+        if rows is None:
+            self.request_page(page)  # Evicted; shown as loading until it is back
+            return "…" if index.column() == 0 else None
+        self.pages.move_to_end(page)
+        section, order_id, created_time, delivered_time, description = rows[offset]
+        header = HISTORY_COLUMN_HEADERS[index.column()]
+        if header == "Order No":
+            return str(order_id)
+        if header == "Section":
+            return section
+        if header == "Order Time":
+            return created_time.strftime("%Y-%m-%d %H:%M") if created_time is not None else ""
+        if header == "Delivered":
+            return delivered_time.strftime("%Y-%m-%d %H:%M") if delivered_time is not None else ""
+        return description.replace("\n", "، ")  # One line per order, so rows need no measuring
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return self.active and not self.at_end and not parent.isValid() and self.page_count not in self.pending
+
+    def fetchMore(self, parent=QModelIndex()):
+        self.request_page(self.page_count)
+
+    def request_page(self, page):
+        if page not in self.pending:
+            self.pending.add(page)
+            self.page_requested.emit(self.generation, page, self.cursors[page])
+
+    def on_page_loaded(self, generation, page, rows):
+        """Store a loaded page, listing its rows if it is the next page."""
+        if generation != self.generation:
+            return
+        self.pending.discard(page)
+        self.pages[page] = rows
+        while len(self.pages) > HISTORY_CACHE_PAGES:
+            self.pages.popitem(last=False)
+        first = page * HISTORY_PAGE_SIZE
+        if page < self.page_count:
+            # A page loaded again after eviction; its rows are already listed
+            self.dataChanged.emit(self.index(first, 0), self.index(first + len(rows) - 1, self.columnCount() - 1))
+            return
+        self.page_count += 1
+        if len(rows) < HISTORY_PAGE_SIZE:
+            self.at_end = True
+        else:
+            section, order_id, _, delivered_time, _ = rows[-1]
+            self.cursors.append((delivered_time, section, order_id))
+        if rows:
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.row_total += len(rows)
+            self.endInsertRows()
+
+    def on_page_failed(self, generation, page):
+        """Allow a failed page to be requested again."""
+        if generation == self.generation:
+            self.pending.discard(page)
+
+    def reset(self):
+        """List the history again from the newest delivered order."""
+        self.beginResetModel()
+        self.generation += 1
+        self.active = True
+        self.cursors = [None]
+        self.page_count = 0
+        self.row_total = 0
+        self.at_end = False
+        self.pages.clear()
+        self.pending.clear()
+        self.endResetModel()
+        self.fetchMore()
+
+
+class HistoryPanel(QWidget):
+    """Tab listing delivered orders, loaded lazily as the user scrolls."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = HistoryTableModel(self)
+        self.worker = HistoryWorker()
+        self.model.page_requested.connect(self.worker.request)
+        self.worker.page_loaded.connect(self.model.on_page_loaded)
+        self.worker.page_failed.connect(self.on_page_failed)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        toolbar_layout.addWidget(self.status_label)
+        toolbar_layout.addStretch()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        toolbar_layout.addWidget(refresh_button)
+        layout.addLayout(toolbar_layout)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setWordWrap(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(
+            HISTORY_COLUMN_HEADERS.index("Description"), QHeaderView.ResizeMode.Stretch
+        )
+        self.table.setStyleSheet("""
+            QTableView {
+                background-color: #ffffff;
+                border: 1px solid #ddd;
+                gridline-color: #ddd;
+            }
+            QHeaderView::section {
+                background-color: #4CAF50; /* Green header, like the board */
+                color: white;
+                padding: 6px;
+                font-weight: bold;
+                border: 1px solid #45a049;
+            }
+        """)
+        layout.addWidget(self.table)
+
+    def showEvent(self, event):
+        """Start loading the first time the history is shown."""
+        super().showEvent(event)
+        if not self.model.active:
+            self.worker.start()
+            self.refresh()
+
+    def refresh(self):
+        """Reload from the newest delivered order, picking up orders delivered since."""
+        self.status_label.clear()
+        self.model.reset()
+
+    def on_page_failed(self, generation, page):
+        self.model.on_page_failed(generation, page)
+        self.status_label.setText("Could not load the order history. Scroll or press Refresh to retry.")
+
+    def stop(self):
+        """Stop the loader thread."""
+        self.worker.stop()
+        self.worker.wait()
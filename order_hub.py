@@ -0,0 +1,237 @@
+# order_hub.py
+"""Shares one database poll between many kitchen screens.
+
+One process (a screen started with SYNC_MODE=hub, or this module run on its
+own) polls the database and broadcasts order changes over TCP. Screens
+started with SYNC_MODE=subscriber receive those changes instead of polling
+SQL Server themselves.
+
+Messages are newline-delimited UTF-8 JSON objects:
+    {"type": "changes", "orders": [[OrderID, *OrderRecord.to_list()], ...]}  hub -> screen
+    {"type": "synced", "orders": [[Section, OrderID], ...]}                  hub -> screen, after the initial state
+    {"type": "wake"}                                                          screen -> hub, after a local status write
+"""
+import json
+import logging
+import sys
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QHostAddress, QTcpServer, QTcpSocket
+from decouple import config
+from order_store import OrderRecord
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SYNC_MODE = config("SYNC_MODE", default="direct")  # direct, hub or subscriber
+HUB_HOST = config("HUB_HOST", default="127.0.0.1")                # Address subscribers connect to
+HUB_LISTEN_HOST = config("HUB_LISTEN_HOST", default="127.0.0.1")  # Address the hub listens on
+HUB_PORT = config("HUB_PORT", default=5757, cast=int)
+HUB_RECONNECT_INTERVAL = config("HUB_RECONNECT_INTERVAL", default=3, cast=int)  # Seconds between reconnect attempts
+HUB_STATE_CHUNK_SIZE = config("HUB_STATE_CHUNK_SIZE", default=200, cast=int)    # Orders per initial state message
+
+
+def encode_message(message):
+    """Encode a message as one line of UTF-8 JSON."""
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def encode_orders(records):
+    """Serialize OrderRecords for a changes message; a list, since OrderIDs repeat across sections."""
+    return [[record.order_id, *record.to_list()] for record in records]
+
+
+def decode_orders(orders):
+    """Rebuild OrderRecords keyed by (Section, OrderID)."""
+    records = (OrderRecord.from_list(order_id, values) for order_id, *values in orders)
+    return {record.key: record for record in records}
+
+
+class LineReader:
+    """Splits a socket's byte stream into decoded JSON messages."""
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data):
+        """Add received bytes and return the complete messages."""
+        self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+        messages = []
+        for line in lines:
+            if not line:
+                continue
+            try:
+                messages.append(json.loads(line))
+            except ValueError as e:
+                logger.error(f"Ignoring malformed hub message: {e}")
+        return messages
+
+
+class OrderHubServer(QObject):
+    """Broadcasts a DatabaseWorker's order changes to subscribed screens."""
+    def __init__(self, database_worker, records, host=HUB_LISTEN_HOST, port=HUB_PORT, parent=None):
+        super().__init__(parent)
+        self.database_worker = database_worker
+        # (Section, OrderID) -> copies, because the boards change their own records optimistically
+        self.orders = {record.key: record.copy() for record in records}
+        self.clients = {}  # QTcpSocket -> LineReader
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self.accept_clients)
+        database_worker.orders_changed.connect(self.broadcast_changes)
+        if self.server.listen(QHostAddress(host), port):
+            logger.info(f"Order hub listening on {host}:{port}.")
+        else:
+            logger.error(f"Order hub could not listen on {host}:{port}: {self.server.errorString()}")
+
+    def accept_clients(self):
+        """Register new screens and send them the current open orders."""
+        while self.server.hasPendingConnections():
+            client = self.server.nextPendingConnection()
+            self.clients[client] = LineReader()
+            client.readyRead.connect(lambda client=client: self.read_client(client))
+            client.disconnected.connect(lambda client=client: self.drop_client(client))
+            self.send_state(client)
+            logger.info(f"Screen connected to the order hub ({len(self.clients)} connected).")
+
+    def send_state(self, client):
+        """Send every open order in chunks, then the full id list so the screen can drop stale rows."""
+        records = list(self.orders.values())
+        for start in range(0, len(records), HUB_STATE_CHUNK_SIZE):
+            chunk = encode_orders(records[start:start + HUB_STATE_CHUNK_SIZE])
+            client.write(encode_message({"type": "changes", "orders": chunk}))
+        client.write(encode_message({"type": "synced", "orders": [list(key) for key in self.orders]}))
+
+    def broadcast_changes(self, changes):
+        """Apply a change set to the hub's state and forward it to every screen."""
+        message = encode_message({"type": "changes", "orders": encode_orders(changes.values())})
+        for key, change in changes.items():
+            if not change.is_open:
+                self.orders.pop(key, None)
+            elif key in self.orders:
+                self.orders[key].status = change.status
+            elif change.has_lines:
+                self.orders[key] = change.copy()
+        for client in self.clients:
+            client.write(message)
+
+    def read_client(self, client):
+        """Handle requests from a screen."""
+        for message in self.clients[client].feed(bytes(client.readAll())):
+            if message.get("type") == "wake":
+                self.database_worker.wake()
+
+    def drop_client(self, client):
+        """Forget a disconnected screen."""
+        self.clients.pop(client, None)
+        client.deleteLater()
+        logger.info(f"Screen disconnected from the order hub ({len(self.clients)} connected).")
+
+    def close(self):
+        """Stop accepting screens and disconnect the current ones."""
+        self.server.close()
+        for client in list(self.clients):
+            client.abort()
+
+
+class HubSubscriber(QObject):
+    """Receives order changes from a hub; a drop-in replacement for DatabaseWorker on the board."""
+    orders_changed = pyqtSignal(dict)  # Same payload as DatabaseWorker.orders_changed
+
+    def __init__(self, known_keys, host=HUB_HOST, port=HUB_PORT, parent=None):
+        super().__init__(parent)
+        self.known_keys = set(known_keys)  # (Section, OrderID) of the orders on the boards
+        self.host = host
+        self.port = port
+        self.running = False
+        self.reader = LineReader()
+        self.socket = QTcpSocket(self)
+        self.socket.connected.connect(self.on_connected)
+        self.socket.readyRead.connect(self.read_messages)
+        self.socket.disconnected.connect(self.schedule_reconnect)
+        self.socket.errorOccurred.connect(self.schedule_reconnect)
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(HUB_RECONNECT_INTERVAL * 1000)
+        self.reconnect_timer.timeout.connect(self.connect_to_hub)
+
+    def start(self):
+        """Connect to the hub."""
+        self.running = True
+        self.connect_to_hub()
+
+    def connect_to_hub(self):
+        if self.running and self.socket.state() == QTcpSocket.SocketState.UnconnectedState:
+            self.reader = LineReader()
+            self.socket.connectToHost(self.host, self.port)
+
+    def on_connected(self):
+        logger.info(f"Connected to the order hub at {self.host}:{self.port}.")
+
+    def schedule_reconnect(self, *args):
+        if self.running and not self.reconnect_timer.isActive():
+            logger.warning(f"Order hub unavailable; retrying in {HUB_RECONNECT_INTERVAL} seconds.")
+            self.reconnect_timer.start()
+
+    def read_messages(self):
+        """Turn hub messages into orders_changed signals."""
+        for message in self.reader.feed(bytes(self.socket.readAll())):
+            if message.get("type") == "changes":
+                changes = decode_orders(message["orders"])
+            elif message.get("type") == "synced":
+                # Orders the hub no longer has were closed while this screen was away
+                closed_keys = self.known_keys - {tuple(key) for key in message["orders"]}
+                changes = {
+                    (section, order_id): OrderRecord.status_change(order_id, None, section)
+                    for section, order_id in closed_keys
+                }
+            else:
+                continue
+            for key, change in changes.items():
+                if change.is_open:
+                    self.known_keys.add(key)
+                else:
+                    self.known_keys.discard(key)
+            if changes:
+                self.orders_changed.emit(changes)
+
+    def wake(self):
+        """Ask the hub to poll now, e.g. after a local status write."""
+        if self.socket.state() == QTcpSocket.SocketState.ConnectedState:
+            self.socket.write(encode_message({"type": "wake"}))
+
+    def stop(self):
+        """Disconnect from the hub."""
+        self.running = False
+        self.reconnect_timer.stop()
+        self.socket.abort()
+
+    def wait(self):
+        """Nothing to wait for; kept so the board can treat this like a worker thread."""
+        return True
+
+
+def main():
+    """Run a headless hub: one database poll shared by every subscribed screen."""
+    from DatabaseWorker import DatabaseWorker
+    from database_connection import Database
+    from metrics import start_metrics_export
+    from order_snapshot import OrderSnapshot
+
+    app = QCoreApplication(sys.argv)
+    metrics_export = start_metrics_export()
+    snapshot = OrderSnapshot()
+    orders, watermark = snapshot.load()
+    database_worker = DatabaseWorker({key: record.status for key, record in orders.items()}, watermark, snapshot)
+    hub_server = OrderHubServer(database_worker, orders.values())
+    database_worker.start()
+    exit_code = app.exec()
+    hub_server.close()
+    database_worker.stop()
+    database_worker.wait()
+    Database.close_pool()
+    metrics_export.stop()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
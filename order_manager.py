@@ -1,4 +1,6 @@
 # order_manager.py
+from order_store import OrderStore
+
 class OrderManager:
     """Manages a list of orders and groups them by OrderID."""
     def __init__(self):
@@ -9,15 +11,9 @@ class OrderManager:
         self.orders.append(order)
 
     def group_orders_by_id(self):
-        """Group orders by OrderID and combine descriptions."""
-        grouped = {}
-        for order in self.orders:
-            if order.order_id not in grouped:
-                grouped[order.order_id] = {
-                "OrderID": order.order_id,
-                "CreatedTime": order.created_time,
-                "Description": [],
-                "Status": order.status,
-                }
-            grouped[order.order_id]["Description"].append(order.description)
-        return grouped
\ No newline at end of file
+        """Group orders by OrderID into OrderRecords with combined descriptions."""
+        rows = sorted(
+            ((order.order_id, order.created_time, order.description, order.status, None, None) for order in self.orders),
+            key=lambda row: row[0],
+        )
+        return {record.order_id: record for record in next(OrderStore.group_rows([rows]), {}).values()}
\ No newline at end of file
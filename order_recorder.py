@@ -0,0 +1,117 @@
+# order_recorder.py
+"""Records what a board is fed, for replaying a real service offline.
+
+A recording is a gzip-compressed file of UTF-8 JSON lines, one per event:
+    {"type": "recording", "version": 1, "started": "2026-10-16 19:02:11"}  header
+    [seconds, "state", [[OrderID, *OrderRecord.to_list()], ...]]             orders shown before the first poll
+    [seconds, "changes", [[OrderID, *OrderRecord.to_list()], ...]]           one orders_changed emission
+    [seconds, "statuses", Section, [[OrderID, status], ...]]                 one status tap (single or bulk)
+where seconds count from the start of the recording. Replay it with
+    python -m benchmarks.replay_recording <recording>
+"""
+import datetime
+import gzip
+import json
+import logging
+import os
+import time
+from PyQt6.QtCore import QObject
+from decouple import config
+from order_hub import decode_orders, encode_orders
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ORDER_RECORDING_DIR = config("ORDER_RECORDING_DIR", default="")  # Record every run into this directory when set
+
+RECORDING_VERSION = 1
+
+
+class OrderRecorder(QObject):
+    """Appends poll results and status taps to a recording as they happen."""
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.started = time.monotonic()
+        self.file = None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = gzip.open(path, "wt", encoding="utf-8")
+            self.write({
+                "type": "recording", "version": RECORDING_VERSION,
+                "started": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            })
+            logger.info(f"Recording orders to {path}.")
+        except OSError as e:
+            logger.error(f"Error opening the order recording {path}: {e}")
+            self.file = None
+
+    @classmethod
+    def for_run(cls, directory=ORDER_RECORDING_DIR, parent=None):
+        """Return a recorder writing a new timestamped file in ``directory``, or None if recording is off."""
+        if not directory:
+            return None
+        name = datetime.datetime.now().strftime("orders_%Y%m%d_%H%M%S.rec.gz")
+        return cls(os.path.join(directory, name), parent)
+
+    def write(self, event):
+        if self.file is None:
+            return
+        try:
+            self.file.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+        except OSError as e:
+            logger.error(f"Error writing the order recording, recording stopped: {e}")
+            self.close()
+
+    def seconds(self):
+        return round(time.monotonic() - self.started, 3)
+
+    def record_state(self, records):
+        """Record the orders the boards start with."""
+        self.write([self.seconds(), "state", encode_orders(records)])
+
+    def record_changes(self, changes):
+        """Record one change set of the order source, keyed by (Section, OrderID)."""
+        self.write([self.seconds(), "changes", encode_orders(changes.values())])
+
+    def record_statuses(self, section, new_statuses):
+        """Record one status tap of OrderID -> status changes."""
+        self.write([self.seconds(), "statuses", section, [[order_id, status] for order_id, status in new_statuses.items()]])
+
+    def close(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError as e:
+                logger.error(f"Error closing the order recording: {e}")
+            self.file = None
+
+
+def read_recording(path):
+    """Yield the (seconds, kind, payload) events of a recording.
+
+    ``payload`` is a dict keyed by (Section, OrderID) for "state" and
+    "changes", and (Section, {OrderID: status}) for "statuses". A recording
+    cut short by a crash is read up to its last complete event.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("type") != "recording":
+            raise ValueError(f"{path} is not an order recording.")
+        try:
+            for line in f:
+                try:
+                    seconds, kind, *values = json.loads(line)
+                except ValueError:
+                    logger.error(f"Skipping a truncated event in {path}.")
+                    return
+                if kind == "statuses":
+                    section, statuses = values
+                    yield seconds, kind, (section, {order_id: status for order_id, status in statuses})
+                else:
+                    yield seconds, kind, decode_orders(values[0])
+        except EOFError:
+            logger.error(f"{path} ends early; replaying up to its last complete event.")
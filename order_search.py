@@ -0,0 +1,128 @@
+# order_search.py
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Optional
+import re
+
+# Arabic diacritics and tatweel, dropped so searches match however a ticket was typed
+ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+# Letter variants folded into one form
+ARABIC_FOLDS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه", "ؤ": "و", "ئ": "ي"})
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Fold case, Arabic letter variants and diacritics."""
+    return ARABIC_MARKS.sub("", text.casefold()).translate(ARABIC_FOLDS)
+
+
+@lru_cache(maxsize=8192)
+def description_tokens(description: str) -> frozenset:
+    """Return the normalized words of a description, without quantities. Identical tickets share one result."""
+    return frozenset(token for token in TOKEN_PATTERN.findall(normalize_text(description)) if not token.isdigit())
+
+
+class OrderSearchIndex:
+    """Indexes of the board's orders for filtering: item -> OrderIDs and word -> OrderIDs.
+
+    Registered as an OrderStore observer, so every order delta updates the
+    indexes directly. Statuses use the store's own status index. Words are
+    also kept in a sorted vocabulary, and OrderIDs in a sorted list of their
+    text, so prefix search is a bisection rather than a scan over every order.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.item_index = {}   # ItemCode -> OrderIDs
+        self.item_names = {}   # ItemCode -> item name
+        self.token_index = {}  # Normalized word -> OrderIDs
+        self.vocabulary = []   # Sorted words of token_index
+        self.order_id_texts = []  # Sorted OrderIDs as text, for number prefix search
+        self.items_changed = False  # Set when an item appears or disappears, for the item picker
+        store.add_observer(self)
+
+    def order_added(self, record):
+        order_id = record.order_id
+        insort(self.order_id_texts, str(order_id))
+        for token in description_tokens(record.description or ""):
+            order_ids = self.token_index.get(token)
+            if order_ids is None:
+                order_ids = self.token_index[token] = set()
+                insort(self.vocabulary, token)
+            order_ids.add(order_id)
+        for item_code, name, _ in record.lines:
+            order_ids = self.item_index.get(item_code)
+            if order_ids is None:
+                order_ids = self.item_index[item_code] = set()
+                self.item_names[item_code] = name
+                self.items_changed = True
+            order_ids.add(order_id)
+
+    def status_changed(self, record, old_status):
+        pass  # Covered by the store's status index
+
+    def order_removed(self, record):
+        order_id = record.order_id
+        order_id_text = str(order_id)
+        position = bisect_left(self.order_id_texts, order_id_text)
+        if position < len(self.order_id_texts) and self.order_id_texts[position] == order_id_text:
+            del self.order_id_texts[position]
+        for token in description_tokens(record.description or ""):
+            order_ids = self.token_index.get(token)
+            if order_ids is not None:
+                order_ids.discard(order_id)
+                if not order_ids:
+                    del self.token_index[token]
+                    del self.vocabulary[bisect_left(self.vocabulary, token)]
+        for item_code, _, _ in record.lines:
+            order_ids = self.item_index.get(item_code)
+            if order_ids is not None:
+                order_ids.discard(order_id)
+                if not order_ids:
+                    del self.item_index[item_code]
+                    del self.item_names[item_code]
+                    self.items_changed = True
+
+    def prefix_matches(self, prefix: str) -> set:
+        """Return the orders with a word starting with ``prefix``."""
+        matches = set()
+        position = bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            matches |= self.token_index[self.vocabulary[position]]
+            position += 1
+        return matches
+
+    def order_id_matches(self, prefix: str) -> set:
+        """Return the orders whose OrderID starts with ``prefix``."""
+        matches = set()
+        position = bisect_left(self.order_id_texts, prefix)
+        while position < len(self.order_id_texts) and self.order_id_texts[position].startswith(prefix):
+            matches.add(int(self.order_id_texts[position]))
+            position += 1
+        return matches
+
+    def search(self, text: str = "", status: Optional[str] = None, item_code=None) -> Optional[set]:
+        """Return the OrderIDs matching every given criterion, or None when nothing is filtered.
+
+        Each word of ``text`` must prefix a word of the description; a number
+        must prefix the OrderID.
+        """
+        criteria = []
+        if status is not None:
+            # Statuses may carry the padding of a fixed-width column
+            criteria.append(set().union(*(
+                order_ids for key, order_ids in self.store.status_index.items() if key.strip() == status
+            )))
+        if item_code is not None:
+            criteria.append(self.item_index.get(item_code, set()))
+        for token in TOKEN_PATTERN.findall(normalize_text(text)):
+            if token.isdigit():
+                criteria.append(self.order_id_matches(token))
+            else:
+                criteria.append(self.prefix_matches(token))
+        if not criteria:
+            return None
+        criteria.sort(key=len)  # Intersect starting from the smallest set
+        result = set(criteria[0])
+        for order_ids in criteria[1:]:
+            result &= order_ids
+        return result
@@ -0,0 +1,118 @@
+# order_snapshot.py
+from order_store import OrderRecord, lines_from_lists, parse_created_time
+from decouple import config
+from typing import Dict, Optional, Tuple
+import datetime
+import json
+import logging
+import os
+import sqlite3
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = config(
+    "SNAPSHOT_PATH",
+    default=os.path.join(os.getenv("LOCALAPPDATA", os.path.expanduser("~")), "ChiefView", "order_snapshot.db"),
+)
+
+
+class OrderSnapshot:
+    """Local SQLite copy of the open orders and the sync watermark, used for instant startup."""
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the snapshot file, creating it if needed. Each thread opens its own connection."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS section_orders (
+                section TEXT NOT NULL,
+                order_id INTEGER NOT NULL,
+                order_type TEXT,
+                created_time TEXT,
+                description TEXT,
+                status TEXT,
+                lines TEXT NOT NULL,
+                PRIMARY KEY (section, order_id)
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
+    def load(self) -> Tuple[Dict[Tuple[str, int], OrderRecord], Optional[datetime.datetime]]:
+        """Return the orders, keyed by (Section, OrderID), and the watermark of the last snapshot."""
+        try:
+            conn = self.connect()
+            try:
+                orders = {
+                    (section, order_id): OrderRecord(
+                        order_id,
+                        parse_created_time(created_time),
+                        description,
+                        status,
+                        lines_from_lists(json.loads(lines)),
+                        section,
+                        order_type,
+                    )
+                    for section, order_id, order_type, created_time, description, status, lines in conn.execute(
+                        """
+                            SELECT section, order_id, order_type, created_time, description, status, lines
+                            FROM section_orders ORDER BY section, order_id
+                        """
+                    )
+                }
+                row = conn.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading order snapshot: {e}")
+            return {}, None
+        watermark = datetime.datetime.fromisoformat(row[0]) if row else None
+        logger.info(f"Loaded {len(orders)} orders from the snapshot.")
+        return orders, watermark
+
+    def save_changes(self, changes: Dict[Tuple[str, int], OrderRecord], watermark: Optional[datetime.datetime]):
+        """Apply a batch of order changes and the new watermark in one transaction.
+
+        ``changes`` has the shape emitted by DatabaseWorker: full records for
+        new orders and status-only records for updated or closed ones. The stored
+        watermark is left as it is when ``watermark`` is None.
+        """
+        try:
+            conn = self.connect()
+            try:
+                with conn:
+                    for (section, order_id), change in changes.items():
+                        if not change.is_open:
+                            conn.execute("DELETE FROM section_orders WHERE section = ? AND order_id = ?", (section, order_id))
+                        elif change.has_lines:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO section_orders VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (
+                                    section,
+                                    order_id,
+                                    change.order_type,
+                                    change.created_time.isoformat(" ") if change.created_time else None,
+                                    change.description,
+                                    change.status,
+                                    json.dumps(change.lines, ensure_ascii=False),
+                                ),
+                            )
+                        else:
+                            conn.execute(
+                                "UPDATE section_orders SET status = ? WHERE section = ? AND order_id = ?",
+                                (change.status, section, order_id),
+                            )
+                    if watermark is not None:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO meta VALUES ('watermark', ?)", (watermark.isoformat(),)
+                        )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error saving order snapshot: {e}")
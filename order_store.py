@@ -0,0 +1,222 @@
+# order_store.py
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import datetime
+import time
+from database_connection import HOME_SECTION, OPEN_STATUSES
+from metrics import metrics
+
+
+class OrderRecord:
+    """One order, or a status-only change to one, in a compact slotted form."""
+    __slots__ = ("order_id", "created_time", "description", "status", "lines", "section", "order_type")
+
+    def __init__(self, order_id: int, created_time, description: Optional[str], status: Optional[str],
+                 lines: Optional[tuple] = None, section: str = HOME_SECTION, order_type: Optional[str] = None):
+        self.order_id = order_id
+        self.created_time = created_time  # datetime, formatted for display by the board
+        self.description = description  # Item lines joined by newlines, None for a status-only change
+        self.status = intern(status) if status is not None else None  # Shared string objects for statuses
+        self.lines = lines or ()  # (ItemCode, item name, Qty) per line
+        self.section = section  # Section database the order belongs to
+        self.order_type = order_type  # OrderType; None for status-only changes
+
+    @classmethod
+    def status_change(cls, order_id: int, status: Optional[str], section: str = HOME_SECTION) -> "OrderRecord":
+        """Build a change that only carries a new status. A status of None means the order disappeared."""
+        return cls(order_id, None, None, status, section=section)
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        """(Section, OrderID): OrderIDs are only unique within a section."""
+        return self.section, self.order_id
+
+    @property
+    def is_open(self) -> bool:
+        """True while the order belongs on the board."""
+        return self.status in OPEN_STATUSES
+
+    @property
+    def has_lines(self) -> bool:
+        """True for a full order rather than a status-only change."""
+        return self.description is not None
+
+    def copy(self) -> "OrderRecord":
+        return OrderRecord(
+            self.order_id, self.created_time, self.description, self.status, self.lines, self.section, self.order_type
+        )
+
+    def to_list(self) -> list:
+        """Serialize to a JSON-friendly [created_time, description, status, lines, section, order_type] list."""
+        created_time = self.created_time.isoformat(" ") if self.created_time is not None else None
+        return [
+            created_time, self.description, self.status, [list(line) for line in self.lines], self.section, self.order_type
+        ]
+
+    @classmethod
+    def from_list(cls, order_id: int, values: list) -> "OrderRecord":
+        created_time, description, status, lines, section, order_type = values
+        return cls(
+            order_id, parse_created_time(created_time), description, status, lines_from_lists(lines),
+            intern(section), intern(order_type) if order_type is not None else None,
+        )
+
+    def __repr__(self):
+        return (
+            f"OrderRecord({self.order_id!r}, {self.created_time!r}, {self.description!r}, {self.status!r}, "
+            f"section={self.section!r}, order_type={self.order_type!r})"
+        )
+
+
+def parse_created_time(value) -> Optional[datetime.datetime]:
+    """Rebuild a CreatedTime stored as ISO text by to_list or the snapshot."""
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def lines_from_lists(lines) -> tuple:
+    """Rebuild (ItemCode, item name, Qty) lines from their JSON lists, sharing the name strings."""
+    return tuple((item_code, intern(name), qty) for item_code, name, qty in lines)
+
+
+class OrderStore:
+    """Open orders keyed by OrderID, with a status index, kept current by change sets.
+
+    Observers registered with add_observer are told about every change
+    through order_added(record), status_changed(record, old_status) and
+    order_removed(record), so derived views can be updated incrementally.
+    """
+    def __init__(self, records: Iterable[OrderRecord] = ()):
+        self.orders: Dict[int, OrderRecord] = {}
+        self.status_index: Dict[str, set] = {}  # Status -> OrderIDs
+        self.observers = []
+        for record in records:
+            self.add(record)
+
+    def add_observer(self, observer):
+        """Register an observer and replay the current orders to it."""
+        self.observers.append(observer)
+        for record in self.orders.values():
+            observer.order_added(record)
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, order_id):
+        return order_id in self.orders
+
+    def __iter__(self):
+        return iter(self.orders)
+
+    def order_ids_with_status(self, status: str) -> set:
+        """Return the OrderIDs that currently have the given status."""
+        return set(self.status_index.get(status, ()))
+
+    def add(self, record: OrderRecord):
+        """Add or replace a full order."""
+        self.remove(record.order_id)
+        self.orders[record.order_id] = record
+        self.status_index.setdefault(record.status, set()).add(record.order_id)
+        for observer in self.observers:
+            observer.order_added(record)
+
+    def set_status(self, order_id: int, status: str) -> bool:
+        """Change an order's status; returns False if the order is unknown."""
+        record = self.orders.get(order_id)
+        if record is None:
+            return False
+        old_status = record.status
+        self.status_index[old_status].discard(order_id)
+        record.status = intern(status)
+        self.status_index.setdefault(record.status, set()).add(order_id)
+        for observer in self.observers:
+            observer.status_changed(record, old_status)
+        return True
+
+    def remove(self, order_id: int) -> Optional[OrderRecord]:
+        """Remove an order and return it, or None if it was unknown."""
+        record = self.orders.pop(order_id, None)
+        if record is not None:
+            self.status_index[record.status].discard(order_id)
+            for observer in self.observers:
+                observer.order_removed(record)
+        return record
+
+    def plan_changes(self, changes: Dict[int, OrderRecord]) -> Tuple[Dict[int, OrderRecord], List[Tuple[int, str]], List[int]]:
+        """Return the (new records, (OrderID, status) updates, removed OrderIDs) a change set calls for.
+
+        Closed orders are removed, full records for unknown orders are
+        inserted and everything else updates the status of a known order.
+        Status-only changes for unknown orders are ignored. Nothing is changed
+        here, so a model can announce each row change before making it.
+        """
+        inserted, updated, removed = {}, [], []
+        for order_id, change in changes.items():
+            if not change.is_open:
+                if order_id in self.orders:
+                    removed.append(order_id)
+            elif order_id in self.orders:
+                if self.orders[order_id].status != change.status:
+                    updated.append((order_id, change.status))
+            elif change.has_lines:
+                inserted[order_id] = change
+        return inserted, updated, removed
+
+    @staticmethod
+    def group_rows(batches: Iterable[List[Tuple]],
+                   chunk_size: Optional[int] = None) -> Iterator[Dict[Tuple[str, int], OrderRecord]]:
+        """Group (OrderID, CreatedTime, Description, Status, Line, Board) rows into orders keyed by (Section, OrderID).
+
+        Board is (Section, OrderType), or None for an order of the home
+        section with no known type. Rows must be ordered by section and
+        OrderID, so an order is complete as soon as a row for another order
+        arrives. Completed orders are yielded in chunks of ``chunk_size``
+        (all at once when it is None).
+        """
+        chunk = {}
+        current_id = None
+        current_board = None
+        current = None
+        lines = []
+        items = []  # (ItemCode, item name, Qty) of the current order; a Line of None is skipped
+        order_count = 0
+        elapsed = 0.0  # Grouping time only; fetching the batches and the consumer's work are excluded
+        for batch in batches:
+            start = time.perf_counter()
+            for order_id, created_time, description, status, line, board in batch:
+                if order_id != current_id or board != current_board:
+                    if current is not None:
+                        current.description = intern("\n".join(lines))  # Identical tickets share one string
+                        current.lines = tuple(items)
+                        chunk[current.key] = current
+                        order_count += 1
+                        if chunk_size is not None and len(chunk) >= chunk_size:
+                            elapsed += time.perf_counter() - start
+                            yield chunk
+                            start = time.perf_counter()
+                            chunk = {}
+                    current_id = order_id
+                    current_board = board
+                    if board is None:
+                        current = OrderRecord(order_id, created_time, None, status)
+                    else:
+                        current = OrderRecord(order_id, created_time, None, status, section=board[0], order_type=board[1])
+                    lines = []
+                    items = []
+                lines.append(description)
+                if line is not None:
+                    items.append(line)
+            elapsed += time.perf_counter() - start
+        if current is not None:
+            current.description = intern("\n".join(lines))
+            current.lines = tuple(items)
+            chunk[current.key] = current
+            order_count += 1
+        metrics.observe("group_rows", elapsed)
+        metrics.increment("orders_grouped", order_count)
+        if chunk:
+            yield chunk
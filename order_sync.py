@@ -0,0 +1,126 @@
+# order_sync.py
+from PyQt6.QtCore import QObject
+import logging
+from DatabaseWorker import DatabaseWorker
+from StatusWriteWorker import StatusWriteWorker
+from database_connection import BOARD_ORDER_TYPES
+from order_hub import SYNC_MODE, HubSubscriber, OrderHubServer
+from order_recorder import OrderRecorder
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class OrderSync(QObject):
+    """Feeds every board from one order source and one status writer.
+
+    A single DatabaseWorker (or hub subscriber) reads all sections and order
+    types with one combined query per poll; its change sets are routed here
+    by section and order type into each board's own model. Status writes from
+    every board share one journal and one writer thread, so adding a board
+    adds neither database load nor threads.
+    """
+    def __init__(self, orders, watermark=None, snapshot=None, journal=None, parent=None):
+        super().__init__(parent)
+        self.orders = orders        # (Section, OrderID) -> OrderRecord to show first
+        self.watermark = watermark  # Server time the initial orders were loaded at
+        self.snapshot = snapshot    # Local snapshot the database worker keeps up to date
+        self.boards = {}            # (Section, OrderType) -> OrderTableWidget
+        self.section_boards = {}    # Section -> its boards
+        self.database_worker = None
+        self.hub_server = None
+        self.recorder = None
+        self.status_writer = StatusWriteWorker(journal)
+        self.status_writer.write_committed.connect(self.on_write_committed)
+        self.status_writer.write_failed.connect(self.on_write_failed)
+        self.status_writer.backlog_changed.connect(self.on_backlog_changed)
+        self.status_writer.start()
+
+    def board_orders(self, section, order_type):
+        """Return OrderID -> OrderRecord of the initial orders that belong on a board."""
+        return {
+            record.order_id: record
+            for record in self.orders.values()
+            if record.section == section and (record.order_type or BOARD_ORDER_TYPES[0]) == order_type
+        }
+
+    def add_board(self, board):
+        """Route the orders of the board's section and order type to it."""
+        self.boards[(board.section, board.order_type)] = board
+        self.section_boards.setdefault(board.section, []).append(board)
+
+    def board_of(self, record):
+        """Return the board an order belongs on, or None if no board shows it."""
+        if record.order_type is not None:
+            return self.boards.get((record.section, record.order_type))
+        # Status-only changes do not carry the type; find the board that has the order
+        for board in self.section_boards.get(record.section, ()):
+            if board.model.has_order(record.order_id) or record.order_id in board.unconfirmed_orders:
+                return board
+        return None
+
+    def start(self):
+        """Start the order sync source: the database worker, or a hub subscriber in subscriber mode."""
+        if SYNC_MODE == "subscriber":
+            self.database_worker = HubSubscriber(self.orders, parent=self)
+        else:
+            statuses = {key: record.status for key, record in self.orders.items()}
+            self.database_worker = DatabaseWorker(statuses, self.watermark, self.snapshot)
+        if SYNC_MODE == "hub":
+            # Share this screen's poll with subscribed screens
+            self.hub_server = OrderHubServer(self.database_worker, self.orders.values(), parent=self)
+        self.database_worker.orders_changed.connect(self.route_changes)
+        self.recorder = OrderRecorder.for_run(parent=self)
+        if self.recorder is not None:
+            # Everything the boards are fed, for benchmarks.replay_recording
+            self.recorder.record_state(self.orders.values())
+            self.database_worker.orders_changed.connect(self.recorder.record_changes)
+            self.status_writer.statuses_enqueued.connect(self.recorder.record_statuses)
+        self.status_writer.write_committed.connect(self.database_worker.wake)  # Pick up the write right away
+        if isinstance(self.database_worker, DatabaseWorker):
+            self.status_writer.batch_written.connect(self.database_worker.rewind)  # Reach back to late journal flushes
+        self.database_worker.start()
+
+    def route_changes(self, changes):
+        """Split a change set keyed by (Section, OrderID) into one OrderID-keyed change set per board."""
+        board_changes = {}
+        for (_, order_id), change in changes.items():
+            board = self.board_of(change)
+            if board is not None:
+                board_changes.setdefault(board, {})[order_id] = change
+        for board, changes in board_changes.items():
+            board.apply_order_changes(changes)
+
+    def on_write_committed(self, section, order_id, status):
+        for board in self.section_boards.get(section, ()):
+            board.on_write_committed(order_id, status)
+
+    def on_write_failed(self, section, order_id, status, error):
+        """Report a rejected write on the board that made it, or the section's first board."""
+        boards = self.section_boards.get(section, ())
+        for board in boards:
+            if order_id in board.unconfirmed_orders:
+                board.on_write_failed(order_id, status, error)
+                return
+        if boards:
+            boards[0].on_write_failed(order_id, status, error)
+        else:
+            logger.error(f"Error updating status for Order ID {order_id} in {section}: {error}")
+
+    def on_backlog_changed(self, count):
+        for board in self.boards.values():
+            board.on_backlog_changed(count)
+
+    def stop(self):
+        """Stop the worker threads; anything unflushed stays journaled."""
+        if self.hub_server is not None:
+            self.hub_server.close()
+        if self.database_worker is not None:
+            self.database_worker.stop()
+        self.status_writer.stop()
+        if self.database_worker is not None:
+            self.database_worker.wait()
+        self.status_writer.wait()  # Waits for a last flush
+        if self.recorder is not None:
+            self.recorder.close()
@@ -0,0 +1,218 @@
+# order_table_model.py
+from bisect import bisect_left
+from functools import lru_cache
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QBrush, QColor, QFont
+from decouple import Csv, config
+from order_store import OrderStore
+import datetime
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Column layout of the order board
+COLUMN_HEADERS = ["Order No", "Order Time", "Elapsed", "Description", "Status", "Action"]
+ORDER_ID_COLUMN = 0
+CREATED_TIME_COLUMN = 1
+ELAPSED_COLUMN = 2
+DESCRIPTION_COLUMN = 3
+STATUS_COLUMN = 4
+ACTION_COLUMN = 5
+
+# Row colors, shared by every row instead of being rebuilt per cell
+ROW_COLORS = ("#ffffff", "#f2f2f2")  # White / light gray alternating rows
+STATUS_COLORS = {
+    "Started": "#d4e4ed",    # Light blue for started
+    "Ready": "#fff3cd",      # Light yellow for ready
+    "Delivered": "#f8d7da",  # Light red for delivered
+}
+
+# Minutes since an order was placed before its elapsed cell turns amber and red, per status
+SLA_THRESHOLDS = {
+    "Placed": config("SLA_PLACED", default="5,10", cast=Csv(float)),
+    "Started": config("SLA_STARTED", default="15,25", cast=Csv(float)),
+    "Ready": config("SLA_READY", default="20,30", cast=Csv(float)),
+}
+SLA_COLORS = ("#ffd966", "#f4a6a6")  # Amber when the first threshold is passed, red after the second
+
+
+@lru_cache(maxsize=None)
+def cached_brush(color: str) -> QBrush:
+    """Return a shared brush for the given color."""
+    return QBrush(QColor(color))
+
+
+@lru_cache(maxsize=None)
+def cached_font(point_size: int, bold: bool = True) -> QFont:
+    """Return a shared font with the given size and weight."""
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setBold(bold)
+    return font
+
+
+class OrderTableModel(QAbstractTableModel):
+    """Exposes an OrderStore to a QTableView, one row per order."""
+    def __init__(self, orders=None, parent=None):
+        super().__init__(parent)
+        self.store = OrderStore()  # OrderID -> OrderRecord, with a status index
+        self.order_ids = []        # Row -> OrderID, kept sorted by OrderID
+        self.now = datetime.datetime.now()  # Clock for the elapsed column, advanced by the board's timer
+        if orders:
+            self.append_orders(orders)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return cell data; only called by the view for visible cells."""
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        record = self.store.orders[self.order_ids[row]]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == ORDER_ID_COLUMN:
+                return str(record.order_id)
+            if column == CREATED_TIME_COLUMN:
+                return record.created_time.strftime("%Y-%m-%d %H:%M") if record.created_time else ""
+            if column == ELAPSED_COLUMN:
+                seconds = self.elapsed_seconds(record)
+                return f"{seconds // 60}:{seconds % 60:02d}" if seconds is not None else ""
+            if column == DESCRIPTION_COLUMN:
+                return record.description
+            if column == STATUS_COLUMN:
+                return record.status
+            return None
+        if role == Qt.ItemDataRole.BackgroundRole:
+            color = STATUS_COLORS.get(record.status, ROW_COLORS[row % 2])
+            if column == ELAPSED_COLUMN:
+                color = self.sla_color(record) or color
+            return cached_brush(color)
+        if role == Qt.ItemDataRole.FontRole and column == DESCRIPTION_COLUMN:
+            return cached_font(16)  # Larger font for the item list
+        return None
+
+    def elapsed_seconds(self, record):
+        """Return the whole seconds since an order was placed, or None if its time is unknown."""
+        if record.created_time is None:
+            return None
+        return max(int((self.now - record.created_time).total_seconds()), 0)
+
+    def sla_color(self, record):
+        """Return the SLA warning color of an order, or None while it is on time."""
+        thresholds = SLA_THRESHOLDS.get(record.status)
+        seconds = self.elapsed_seconds(record)
+        if not thresholds or seconds is None:
+            return None
+        minutes = seconds / 60
+        for threshold, color in reversed(list(zip(thresholds, SLA_COLORS))):
+            if minutes >= threshold:
+                return color
+        return None
+
+    def order_id_at(self, row):
+        """Return the OrderID displayed in the given row."""
+        return self.order_ids[row]
+
+    def status_of(self, order_id):
+        """Return the current status of an order."""
+        return self.store.orders[order_id].status
+
+    def record_of(self, order_id):
+        """Return the OrderRecord of an order on the board."""
+        return self.store.orders[order_id]
+
+    def has_order(self, order_id):
+        """Return True if the order is on the board."""
+        return order_id in self.store
+
+    def row_of(self, order_id):
+        """Return the row of an order, or -1 if it is not on the board.
+
+        Rows are kept sorted by OrderID, so the row is found by bisection.
+        """
+        if order_id not in self.store:
+            return -1
+        return bisect_left(self.order_ids, order_id)
+
+    def order_ids_with_status(self, status):
+        """Return the OrderIDs that currently have the given status."""
+        return self.store.order_ids_with_status(status)
+
+    def apply_changes(self, changes):
+        """Apply a change set of OrderRecords as row-level removals, updates and inserts, as the store plans them."""
+        new_orders, updates, removed_ids = self.store.plan_changes(changes)
+        for order_id in removed_ids:
+            self.remove_order(order_id)
+        for order_id, status in updates:
+            self.set_status(order_id, status)
+        self.append_orders(new_orders)
+
+    def append_orders(self, new_orders):
+        """Insert new OrderRecords, keeping rows sorted by OrderID."""
+        new_ids = sorted(order_id for order_id in new_orders if order_id not in self.store)
+        if not new_ids:
+            return
+        if not self.order_ids or new_ids[0] > self.order_ids[-1]:
+            # Usual case: newer orders go after every row, in one block
+            first_row = len(self.order_ids)
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(new_ids) - 1)
+            for order_id in new_ids:
+                self.store.add(new_orders[order_id])
+                self.order_ids.append(order_id)
+            self.endInsertRows()
+            return
+        for order_id in new_ids:
+            row = bisect_left(self.order_ids, order_id)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.store.add(new_orders[order_id])
+            self.order_ids.insert(row, order_id)
+            self.endInsertRows()
+
+    def set_status(self, order_id, status):
+        """Change the status of an order and repaint its row."""
+        row = self.row_of(order_id)
+        if row == -1:
+            logger.error(f"Row not found for OrderID: {order_id}")
+            return False
+        self.store.set_status(order_id, status)
+        self.dataChanged.emit(
+            self.index(row, 0),
+            self.index(row, len(COLUMN_HEADERS) - 1),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole],
+        )
+        return True
+
+    def remove_order(self, order_id):
+        """Remove an order from the board."""
+        row = self.row_of(order_id)
+        if row == -1:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.order_ids[row]
+        self.store.remove(order_id)
+        self.endRemoveRows()
+        return True
+
+    def remove_orders_with_status(self, status):
+        """Remove every order with the given status and return how many were removed."""
+        order_ids = self.order_ids_with_status(status)
+        for order_id in order_ids:
+            self.remove_order(order_id)
+        return len(order_ids)
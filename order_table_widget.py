@@ -1,23 +1,58 @@
+from PyQt6.QtCore import QRect, QTimer
 from PyQt6.QtWidgets import (
-    QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QHeaderView, QScrollArea, QVBoxLayout, QWidget
+    QAbstractItemView, QComboBox, QTableView, QMessageBox, QHeaderView, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QScrollArea, QVBoxLayout, QWidget
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QColor, QFont, QBrush
 from PyQt6.QtWidgets import QScroller, QSizePolicy
-from database_connection import Database
+from decouple import config
+import datetime
 import logging
-from DatabaseWorker import DatabaseWorker
+from database_connection import BOARD_ORDER_TYPES, HOME_SECTION, STATUS_SEQUENCE
+from order_table_model import (
+    OrderTableModel, ORDER_ID_COLUMN, CREATED_TIME_COLUMN, ELAPSED_COLUMN, DESCRIPTION_COLUMN, STATUS_COLUMN,
+    ACTION_COLUMN, cached_font
+)
+from row_heights import RowHeightCache
+from order_search import OrderSearchIndex
+from action_button_delegate import ActionButtonDelegate
+from metrics import timed
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Status an order moves to when it is advanced
+NEXT_STATUS = {"Placed": "Started", "Started": "Ready", "Ready": "Delivered"}
+
+# Seconds between ticks of the elapsed column
+ELAPSED_TICK_INTERVAL = config("ELAPSED_TICK_INTERVAL", default=1.0, cast=float)
+
+class TimedTableView(QTableView):
+    """QTableView that records how long each repaint takes."""
+    def paintEvent(self, event):
+        with timed("table_paint"):
+            super().paintEvent(event)
+
+
 class OrderTableWidget(QWidget):
-    """Displays orders in a table and handles status updates."""
-    def __init__(self, grouped_orders):
+    """Displays the orders of one section and order type in a table and handles status updates.
+
+    Orders arrive through apply_order_changes from an OrderSync, which also
+    owns the status writer shared by every board.
+    """
+    def __init__(self, orders, status_writer, section=HOME_SECTION, order_type=BOARD_ORDER_TYPES[0]):
         super().__init__()
-        self.grouped_orders = grouped_orders  # Pass grouped_orders as an argument
+        self.model = OrderTableModel(orders)  # OrderID -> OrderRecord to show first
+        self.status_writer = status_writer  # Journals status changes and writes them in the background
+        self.section = section
+        self.order_type = order_type
+        self.unconfirmed_orders = {}  # OrderID -> last committed order data, while a status write is queued
+        self.deferred_changes = {}  # OrderID -> latest polled change of an unconfirmed order, applied once its write settles
+        self.failed_writes = []  # (OrderID, status, error) rejected since the last error dialog
+        self.search_index = OrderSearchIndex(self.model.store)
+        self.hidden_orders = set()  # OrderIDs whose rows the filter bar hides
+        self.filter_scheduled = False
         self.initUI()
-        self.start_database_worker()
+        self.restore_journaled_statuses()
 
     def initUI(self):
         """Initialize the table UI."""
@@ -25,6 +60,54 @@ class OrderTableWidget(QWidget):
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)  # Remove margins
 
+        # Banner shown while status changes wait in the journal for the database
+        self.backlog_label = QLabel()
+        self.backlog_label.setStyleSheet(
+            "background-color: #fff3cd; color: #856404; font-weight: bold; padding: 6px;"
+        )
+        self.backlog_label.setVisible(False)
+        main_layout.addWidget(self.backlog_label)
+
+        # Filter bar, then the bulk action for the rows selected on the board
+        toolbar_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search order no. or item")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setFont(cached_font(12))
+        self.search_edit.textChanged.connect(self.apply_filter)
+        toolbar_layout.addWidget(self.search_edit, 2)
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("All statuses", None)
+        for status in NEXT_STATUS:
+            self.status_filter.addItem(status, status)
+        self.status_filter.currentIndexChanged.connect(self.apply_filter)
+        toolbar_layout.addWidget(self.status_filter)
+        self.item_filter = QComboBox()
+        self.item_filter.setMinimumContentsLength(16)
+        self.item_filter.currentIndexChanged.connect(self.apply_filter)
+        toolbar_layout.addWidget(self.item_filter)
+        self.update_item_filter()
+        toolbar_layout.addStretch()
+        self.advance_button = QPushButton("Advance selected")
+        self.advance_button.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50; /* Green button */
+                color: white;
+                font-weight: bold;
+                border: none;
+                padding: 8px 16px;
+                font-size: 16px;
+                border-radius: 5px;
+            }
+            QPushButton:disabled {
+                background-color: #cccccc; /* Gray while nothing is selected */
+            }
+        """)
+        self.advance_button.setEnabled(False)
+        self.advance_button.clicked.connect(self.advance_selected)
+        toolbar_layout.addWidget(self.advance_button)
+        main_layout.addLayout(toolbar_layout)
+
         # Create a scroll area for the table
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)  # Allow the widget to resize
@@ -34,24 +117,34 @@ class OrderTableWidget(QWidget):
         table_layout = QVBoxLayout(table_container)
         table_layout.setContentsMargins(0, 0, 0, 0)  # Remove margins
 
-        # Create the table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Order No", "Order Time", "Description", "Status", "Action"])
+        # Create the table view; only visible rows are painted
+        self.table = TimedTableView()
+        self.table.setModel(self.model)
+
+        # Tapping rows toggles them in the selection used by "Advance selected"
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.table.selectionModel().selectionChanged.connect(self.update_advance_button)
+
+        # Paint the action button with a delegate instead of per-row widgets
+        self.action_delegate = ActionButtonDelegate(self.table)
+        self.action_delegate.clicked.connect(self.change_status)
+        self.table.setItemDelegateForColumn(ACTION_COLUMN, self.action_delegate)
+        self.table.setMouseTracking(True)  # Needed for the button hover color
 
         # Set size policy for the table
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
         # Set table styles
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;  /* White background */
                 border: 1px solid #ddd;    /* Light gray border */
                 font-size: 14px;
                 color: #333;               /* Dark gray text */
                 gridline-color: #ddd;      /* Light gray gridlines */
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 10px;
             }
             QHeaderView::section {
@@ -62,52 +155,50 @@ class OrderTableWidget(QWidget):
                 font-size: 16px;           /* Increase header font size */
                 border: 1px solid #45a049; /* Darker green border */
             }
-            QPushButton {
-                background-color: #4CAF50; /* Green button */
-                color: white;
-                font-weight: bold; /* Bold text */
-                border: none;
-                padding: 5px 10px;
-                font-size: 14px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049; /* Darker green on hover */
-            }
-            QPushButton:disabled {
-                background-color: #cccccc; /* Gray for disabled buttons */
-            }
         """)
 
         # Set font for table items (bold)
-        font = QFont()
-        font.setPointSize(12)  # Increase font size for better readability
-        font.setBold(True)     # Make text bold
-        self.table.setFont(font)
+        self.table.setFont(cached_font(12))  # Bold, larger font for better readability
 
         # Enable word wrap for cells
         self.table.setWordWrap(True)
 
         # Set column widths (increase width as needed)
-        self.table.setColumnWidth(0, 100)  # Order ID
-        self.table.setColumnWidth(1, 130)  # Date and Time
-        self.table.setColumnWidth(2, 600)  # Description (wider column)
-        self.table.setColumnWidth(3, 80)  # Status
-        self.table.setColumnWidth(4, 140)  # Action
+        self.table.setColumnWidth(ORDER_ID_COLUMN, 100)  # Order ID
+        self.table.setColumnWidth(CREATED_TIME_COLUMN, 130)  # Date and Time
+        self.table.setColumnWidth(ELAPSED_COLUMN, 90)  # Elapsed
+        self.table.setColumnWidth(DESCRIPTION_COLUMN, 600)  # Description (wider column)
+        self.table.setColumnWidth(STATUS_COLUMN, 80)  # Status
+        self.table.setColumnWidth(ACTION_COLUMN, 140)  # Action
 
         # Set row height to accommodate the button
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Stretch "Description" column
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)  # Allow manual resizing of "Date and Time"
-        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)  # Resize rows to content
-
-        # Populate table with grouped orders if available
-        if self.grouped_orders:
-            self.table.setRowCount(len(self.grouped_orders))
-            for row, (order_id, order_data) in enumerate(self.grouped_orders.items()):
-                self.populate_row(row, order_id, order_data)
-        else:
+        self.table.horizontalHeader().setSectionResizeMode(DESCRIPTION_COLUMN, QHeaderView.ResizeMode.Stretch)  # Stretch "Description" column
+        self.table.horizontalHeader().setSectionResizeMode(CREATED_TIME_COLUMN, QHeaderView.ResizeMode.Interactive)  # Allow manual resizing of "Date and Time"
+        # Row heights come from a cache and are set only for rows that changed, instead of ResizeToContents
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.row_heights = RowHeightCache(self.table)
+        self.model.rowsInserted.connect(lambda parent, first, last: self.row_heights.resize_rows(first, last))
+        self.model.dataChanged.connect(self.on_rows_changed)
+        self.model.modelReset.connect(self.resize_all_rows)
+        # New rows and status changes may enter or leave the filter
+        self.model.rowsInserted.connect(self.schedule_filter)
+        self.model.dataChanged.connect(self.schedule_filter)
+        # Column widths settle after the window is shown and change when it is resized
+        self.resize_rows_timer = QTimer(self)
+        self.resize_rows_timer.setSingleShot(True)
+        self.resize_rows_timer.setInterval(50)
+        self.resize_rows_timer.timeout.connect(self.resize_all_rows)
+        self.table.horizontalHeader().sectionResized.connect(lambda *args: self.resize_rows_timer.start())
+        self.resize_rows_timer.start()
+
+        # One shared clock for the elapsed column; each tick repaints only the visible elapsed cells
+        self.elapsed_timer = QTimer(self)
+        self.elapsed_timer.setInterval(int(ELAPSED_TICK_INTERVAL * 1000))
+        self.elapsed_timer.timeout.connect(self.tick_elapsed)
+        self.elapsed_timer.start()
+
+        if self.model.rowCount() == 0:
             logger.warning("No orders found to display.")
-            self.table.setRowCount(0)  # Set row count to 0 if no orders are found
 
         # Enable touch gestures for scrolling
         QScroller.grabGesture(self.table.viewport(), QScroller.ScrollerGestureType.LeftMouseButtonGesture)
@@ -121,102 +212,84 @@ class OrderTableWidget(QWidget):
         # Add the scroll area to the main layout
         main_layout.addWidget(scroll_area)
 
-    def populate_row(self, row, order_id, order_data):
-        """Populate a row in the table with order data."""
-        # Set alternating row colors
-        if row % 2 == 0:
-            row_color = QColor("#ffffff")  # White
-        else:
-            row_color = QColor("#f2f2f2")  # Light gray
-
-        # Order ID
-        order_id_item = QTableWidgetItem(str(order_id))
-        order_id_item.setFlags(order_id_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-        order_id_item.setBackground(QBrush(row_color))  # Set row color
-        self.table.setItem(row, 0, order_id_item)
-
-        # Date and Time
-        created_time_item = QTableWidgetItem(str(order_data["CreatedTime"]))
-        created_time_item.setFlags(created_time_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-        created_time_item.setBackground(QBrush(row_color))  # Set row color
-        self.table.setItem(row, 1, created_time_item)
-
-        # Description (combine multiple items into a text area)
-        description_text = "\n".join(order_data["Description"])
-        description_item = QTableWidgetItem(description_text)
-        description_item.setBackground(QBrush(row_color))  # Set row color
-        description_font = QFont()
-        description_font.setPointSize(16)  # Increase font size (e.g., 14)
-        description_font.setBold(True)     # Make text bold
-        description_item.setFont(description_font)
-        self.table.setItem(row, 2, description_item)
-
-        # Status
-        status_item = QTableWidgetItem(order_data["Status"])
-        status_item.setFlags(status_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-        status_item.setBackground(QBrush(row_color))  # Set row color
-        self.table.setItem(row, 3, status_item)
-
-        # Action button to change status (with fixed size, bold text, and green background)
-        action_button = QPushButton("✓")
-        action_button.setFixedSize(30, 30)
-        action_button.setProperty("OrderID", order_id)  # Store OrderID in the button
-        action_button.clicked.connect(self.change_status)
-
-        # Create a container widget for the button
-        button_container = QWidget()
-        button_layout = QVBoxLayout(button_container)
-        button_layout.setContentsMargins(0, 0, 0, 0)  # Remove margins
-
-        # Add a spacer to push the button to the center
-        button_layout.addStretch()  # Add stretchable space above the button
-        button_layout.addWidget(action_button, alignment=Qt.AlignmentFlag.AlignCenter)  # Center the button
-        button_layout.addStretch()  # Add stretchable space below the button
-
-        # Set the container widget as the cell widget
-        self.table.setCellWidget(row, 4, button_container)
-
-    def change_status(self):
-        """Change the status of the order using OrderID."""
-        button = self.sender()  # Get the button that was clicked
-        if not button:
-            logger.error("Button not found")
+    def on_rows_changed(self, top_left, bottom_right, roles=()):
+        """Re-measure rows whose description may have changed."""
+        if top_left.column() <= DESCRIPTION_COLUMN <= bottom_right.column():
+            self.row_heights.resize_rows(top_left.row(), bottom_right.row())
+
+    def resize_all_rows(self):
+        """Set every row's height; only rows not yet measured at the current widths are laid out."""
+        if self.model.rowCount():
+            self.row_heights.resize_rows(0, self.model.rowCount() - 1)
+
+    def tick_elapsed(self):
+        """Advance the board's clock and repaint the elapsed cells of the rows on screen."""
+        self.model.now = datetime.datetime.now()
+        viewport = self.table.viewport()
+        first = self.table.rowAt(0)
+        if first == -1:
             return
-
-        order_id = button.property("OrderID")
-        if not order_id:
-            logger.error("OrderID not found")
-            return
-
-        # Find the row corresponding to the OrderID
-        row = -1
-        for i in range(self.table.rowCount()):
-            if int(self.table.item(i, 0).text()) == order_id:
-                row = i
-                break
-
-        if row == -1:
-            logger.error(f"Row not found for OrderID: {order_id}")
+        last = self.table.rowAt(viewport.height() - 1)
+        if last == -1:
+            last = self.model.rowCount() - 1
+        top = self.table.rowViewportPosition(first)
+        bottom = self.table.rowViewportPosition(last) + self.table.rowHeight(last)
+        left = self.table.columnViewportPosition(ELAPSED_COLUMN)
+        viewport.update(QRect(left, top, self.table.columnWidth(ELAPSED_COLUMN), bottom - top))
+
+    def update_item_filter(self):
+        """List the items on the board in the item filter, keeping the current choice."""
+        self.search_index.items_changed = False
+        current = self.item_filter.currentData()
+        self.item_filter.blockSignals(True)
+        self.item_filter.clear()
+        self.item_filter.addItem("All items", None)
+        names = self.search_index.item_names
+        for item_code in sorted(names, key=lambda code: names[code]):
+            self.item_filter.addItem(names[item_code], item_code)
+        self.item_filter.setCurrentIndex(max(self.item_filter.findData(current), 0))
+        self.item_filter.blockSignals(False)
+
+    def schedule_filter(self, *args):
+        """Re-apply the filter once the current batch of row changes is done."""
+        if not self.filter_scheduled:
+            self.filter_scheduled = True
+            QTimer.singleShot(0, self.apply_filter)
+
+    def apply_filter(self, *args):
+        """Hide the rows that do not match the filter bar, changing only rows whose visibility differs."""
+        self.filter_scheduled = False
+        if self.search_index.items_changed:
+            self.update_item_filter()
+        matches = self.search_index.search(
+            self.search_edit.text(), self.status_filter.currentData(), self.item_filter.currentData()
+        )
+        store = self.model.store
+        self.hidden_orders &= store.orders.keys()  # Removed rows took their hidden state with them
+        hidden = set() if matches is None else store.orders.keys() - matches
+        self.table.setUpdatesEnabled(False)  # Relayout once, not once per toggled row
+        for order_id in hidden - self.hidden_orders:
+            self.table.setRowHidden(self.model.row_of(order_id), True)
+        for order_id in self.hidden_orders - hidden:
+            self.table.setRowHidden(self.model.row_of(order_id), False)
+        self.table.setUpdatesEnabled(True)
+        self.hidden_orders = hidden
+
+    def change_status(self, index):
+        """Change the status of the order in the clicked row."""
+        if not index.isValid():
+            logger.error("Row not found")
             return
 
-        # Get the status item
-        status_item = self.table.item(row, 3)
-        if not status_item:
-            logger.error("Status item not found")
-            return
+        order_id = self.model.order_id_at(index.row())
 
         # Determine the new status
-        current_status = status_item.text().strip()
-        if current_status == "Placed":
-            new_status = "Started"
-        elif current_status == "Started":
-            new_status = "Ready"
-        elif current_status == "Ready":
-            new_status = "Delivered"
-        elif current_status == "Delivered":
+        current_status = self.model.status_of(order_id).strip()
+        if current_status == "Delivered":
             QMessageBox.information(self, "Order Status", "Order is already delivered.")
             return
-        else:
+        new_status = NEXT_STATUS.get(current_status)
+        if new_status is None:
             QMessageBox.critical(self, "Error", "Invalid status.")
             return
 
@@ -228,84 +301,142 @@ class OrderTableWidget(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
-        # Update status in the database
+        # Show the change right away; the database write happens in the background
         if confirmation == QMessageBox.StandardButton.Yes:
-            try:
-                with Database() as db:
-                    db.update_status(order_id, new_status)
-                # Update status in the table
-                status_item.setText(new_status)
-                self.update_row_color(row, new_status)
-
-                if new_status == "Delivered":
-                    button.setEnabled(False)  # Disable the button
-                    message = f"Order {order_id} has been delivered."
-                else:
-                    message = f"Order {order_id} status changed to {new_status}."
-                QMessageBox.information(self, "Order Status Updated", message)
-            except Exception as e:
-                logger.error(f"Error updating status for Order ID {order_id}: {e}")
-                QMessageBox.critical(self, "Error", f"Failed to update status: {e}")
+            self.set_status_optimistically(order_id, new_status)
         else:
             logger.info(f"Status change for Order ID {order_id} was canceled by the user.")
 
-    def update_row_color(self, row, status):
-        """Update the background color of the entire row based on the status."""
-        if row < 0 or row >= self.table.rowCount():
-            logger.error(f"Invalid row index: {row}")
+    def selected_order_ids(self):
+        """Return the OrderIDs of the selected rows the filter shows, in board order."""
+        rows = sorted(
+            index.row() for index in self.table.selectionModel().selectedRows() if not self.table.isRowHidden(index.row())
+        )
+        return [self.model.order_id_at(row) for row in rows]
+
+    def update_advance_button(self, *args):
+        """Show how many orders the bulk action would advance."""
+        count = len(self.selected_order_ids())
+        self.advance_button.setText(f"Advance selected ({count})" if count else "Advance selected")
+        self.advance_button.setEnabled(count > 0)
+
+    def advance_selected(self):
+        """Move every selected order to its next status after a single confirmation."""
+        new_statuses = {}
+        for order_id in self.selected_order_ids():
+            new_status = NEXT_STATUS.get(self.model.status_of(order_id).strip())
+            if new_status is not None:
+                new_statuses[order_id] = new_status
+        if not new_statuses:
             return
 
-        logger.info(f"Updating row {row} color for status: {status}")
-        if status == "Started":
-            row_color = QColor("#d4e4ed")  # Light blue for started
-        elif status == "Ready":
-            row_color = QColor("#fff3cd")  # Light yellow for ready
-        elif status == "Delivered":
-            row_color = QColor("#f8d7da")  # Light red for delivered
+        lines = [f"Order {order_id} → {new_status}" for order_id, new_status in list(new_statuses.items())[:15]]
+        if len(new_statuses) > 15:
+            lines.append(f"… and {len(new_statuses) - 15} more")
+        confirmation = QMessageBox.question(
+            self,
+            "Confirm Status Change",
+            f"Do you want to advance {len(new_statuses)} orders?\n\n" + "\n".join(lines),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if confirmation == QMessageBox.StandardButton.Yes:
+            self.table.clearSelection()
+            self.set_statuses_optimistically(new_statuses)
         else:
-            row_color = QColor("#ffffff")  # Default white
-
-        for col in range(self.table.columnCount()):
-            item = self.table.item(row, col)
-            if item:
-                item.setBackground(QBrush(row_color))
+            logger.info(f"Bulk status change for {len(new_statuses)} orders was canceled by the user.")
+
+    def set_status_optimistically(self, order_id, new_status):
+        """Update the board immediately and queue the status write."""
+        self.set_statuses_optimistically({order_id: new_status})
+
+    def set_statuses_optimistically(self, new_statuses):
+        """Update the board immediately for OrderID -> status changes and queue them as one write."""
+        with timed("status_tap"):
+            # Journaled before it is shown, so the taps survive outages and restarts
+            if not self.status_writer.enqueue_many(new_statuses, self.section):
+                order_list = ", ".join(str(order_id) for order_id in new_statuses)
+                QMessageBox.critical(self, "Error", f"Could not record the status change for Order {order_list}.")
+                return
+            for order_id, new_status in new_statuses.items():
+                if order_id not in self.unconfirmed_orders:
+                    # Remember the last state known to be in the database, to roll back to on failure
+                    self.unconfirmed_orders[order_id] = self.model.record_of(order_id).copy()
+                self.model.set_status(order_id, new_status)
+            self.remove_delivered_orders()
+
+    def restore_journaled_statuses(self):
+        """Show status changes journaled before a restart that have not reached the database yet."""
+        for order_id, status in self.status_writer.journal.pending_statuses(self.section).items():
+            if self.model.has_order(order_id):
+                self.unconfirmed_orders[order_id] = self.model.record_of(order_id).copy()
+                self.model.set_status(order_id, status)
         self.remove_delivered_orders()
-        
+
+    def on_write_committed(self, order_id, status):
+        """Forget the rollback state once the board matches the database."""
+        confirmed = self.unconfirmed_orders.get(order_id)
+        if confirmed is None:
+            return
+        confirmed.status = status
+        current_status = self.model.status_of(order_id) if self.model.has_order(order_id) else "Delivered"
+        if current_status == status:
+            del self.unconfirmed_orders[order_id]
+            change = self.deferred_changes.pop(order_id, None)
+            # A change polled before the write landed may be older than it; the database only moves forward
+            if change is not None and not (
+                change.is_open and STATUS_SEQUENCE.index(change.status) < STATUS_SEQUENCE.index(status)
+            ):
+                self.model.apply_changes({order_id: change})
+
+    def on_write_failed(self, order_id, status, error):
+        """Roll the row back to its last committed state and tell the user."""
+        logger.error(f"Error updating status for Order ID {order_id}: {error}")
+        confirmed = self.unconfirmed_orders.pop(order_id, None)
+        if confirmed is not None:
+            if self.model.has_order(order_id):
+                self.model.set_status(order_id, confirmed.status)
+            else:
+                self.model.append_orders({order_id: confirmed})
+            # Then show what the database has, e.g. the status of the station that overtook the write
+            change = self.deferred_changes.pop(order_id, None)
+            if change is not None:
+                self.model.apply_changes({order_id: change})
+        # Failures of one batch arrive back to back; report them in one dialog
+        self.failed_writes.append((order_id, status, error))
+        if len(self.failed_writes) == 1:
+            QTimer.singleShot(0, self.report_failed_writes)
+
+    def report_failed_writes(self):
+        """Show the rejected status changes collected by on_write_failed."""
+        failures, self.failed_writes = self.failed_writes, []
+        if len(failures) == 1:
+            order_id, status, error = failures[0]
+            QMessageBox.critical(self, "Error", f"Failed to change Order {order_id} to '{status}': {error}")
+        else:
+            lines = [f"Order {order_id} → '{status}': {error}" for order_id, status, error in failures]
+            QMessageBox.critical(self, "Error", f"Failed to change {len(failures)} orders:\n\n" + "\n".join(lines))
+
+    def on_backlog_changed(self, count):
+        """Show how many status changes are waiting for the database."""
+        self.backlog_label.setText(f"Database unreachable: {count} status changes saved locally and will be sent automatically.")
+        self.backlog_label.setVisible(count > 0)
+
     def remove_delivered_orders(self):
-        """Remove rows with a Delivered status from the table."""
-        rows_to_remove = []
-        for row in range(self.table.rowCount()):
-            status_item = self.table.item(row, 3)  # Status is in column 3
-            if status_item and status_item.text().strip() == "Delivered":
-                rows_to_remove.append(row)
-
-        # Remove rows in reverse order to avoid index issues
-        for row in reversed(rows_to_remove):
-            order_id = int(self.table.item(row, 0).text())  # OrderID is in column 0
-            self.table.removeRow(row)  # Remove the row from the table
-            if order_id in self.grouped_orders:
-                del self.grouped_orders[order_id]  # Remove the order from grouped_orders
-
-        logger.info(f"Removed {len(rows_to_remove)} delivered orders from the table.")
-            
-
-    def start_database_worker(self):
-        """Start the database worker thread."""
-        max_order_id = max(self.grouped_orders.keys(), default=0)
-        self.database_worker = DatabaseWorker(max_order_id)
-        self.database_worker.new_orders_fetched.connect(self.append_orders_to_table)
-        self.database_worker.start()
-
-    def append_orders_to_table(self, new_grouped_orders):
-        """Append new orders to the table."""
-        current_row_count = self.table.rowCount()
-        self.table.setRowCount(current_row_count + len(new_grouped_orders))
-
-        for row, (order_id, order_data) in enumerate(new_grouped_orders.items(), start=current_row_count):
-            self.populate_row(row, order_id, order_data)
-
-    def closeEvent(self, event):
-        """Ensure the worker thread is stopped when the widget is closed."""
-        self.database_worker.stop()
-        self.database_worker.wait()
-        event.accept()
\ No newline at end of file
+        """Remove rows with a Delivered status, found through the model's status index."""
+        removed = self.model.remove_orders_with_status("Delivered")
+        logger.info(f"Removed {removed} delivered orders from the table.")
+
+    def apply_order_changes(self, changes):
+        """Apply inserted, updated and closed orders as row-level changes."""
+        with timed("table_update"):
+            self.table.setUpdatesEnabled(False)  # Repaint once per chunk, not once per row
+            if self.unconfirmed_orders:
+                # The queued local writes take precedence; the polled changes are applied once they settle
+                self.deferred_changes.update(
+                    (order_id, change) for order_id, change in changes.items() if order_id in self.unconfirmed_orders
+                )
+                changes = {
+                    order_id: change for order_id, change in changes.items() if order_id not in self.unconfirmed_orders
+                }
+            self.model.apply_changes(changes)
+            self.table.setUpdatesEnabled(True)
@@ -0,0 +1,44 @@
+# poll_scheduler.py
+from decouple import config
+import threading
+
+# Polling intervals in seconds
+POLL_MIN_INTERVAL = config("POLL_MIN_INTERVAL", default=1.0, cast=float)   # While orders are flowing
+POLL_MAX_INTERVAL = config("POLL_MAX_INTERVAL", default=20.0, cast=float)  # Ceiling when idle or failing
+POLL_BACKOFF = config("POLL_BACKOFF", default=1.5, cast=float)             # Growth factor per idle or failed poll
+
+
+class PollScheduler:
+    """Decides how long to wait between polls and lets other threads cut the wait short."""
+    def __init__(self, min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL, backoff=POLL_BACKOFF):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.condition = threading.Condition()
+        self.woken = False
+
+    def record_changes(self, change_count):
+        """Poll quickly while orders are changing and back off when idle."""
+        if change_count:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def record_error(self):
+        """Back off after a failed poll so an unreachable database is not hammered."""
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def wait(self):
+        """Sleep until the next poll is due or wake() is called."""
+        with self.condition:
+            if not self.woken:
+                self.condition.wait(self.interval)
+            self.woken = False
+
+    def wake(self):
+        """Make the next poll happen now, e.g. after a local status write or on shutdown."""
+        with self.condition:
+            self.woken = True
+            self.interval = self.min_interval
+            self.condition.notify_all()
@@ -0,0 +1,140 @@
+# prep_list.py
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
+from PyQt6.QtWidgets import QHeaderView, QLabel, QTableView, QVBoxLayout, QWidget
+from database_connection import format_quantity
+from order_table_model import cached_font
+
+# Orders whose items still have to be made
+PREP_STATUSES = ("Placed", "Started")
+
+QUANTITY_ROLE = Qt.ItemDataRole.UserRole  # Raw quantity, used for sorting
+
+
+class PrepListModel(QAbstractTableModel):
+    """Open quantity per kitchen item across Placed and Started orders.
+
+    Registered as an OrderStore observer, so each inserted, advanced or
+    closed order adjusts the counters of its own items instead of the
+    board being rescanned. Changed rows are signalled once per event loop pass.
+    """
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.item_codes = []  # Row -> ItemCode; an item keeps its row once seen
+        self.rows = {}        # ItemCode -> row
+        self.names = {}       # ItemCode -> item name
+        self.quantities = {}  # ItemCode -> open quantity
+        self.changed = set()  # ItemCodes changed since the last flush
+        self.flush_scheduled = False
+        store.add_observer(self)
+        self.flush()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.item_codes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return ("Item", "Qty")[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item_code = self.item_codes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return self.names[item_code]
+            return format_quantity(self.quantities[item_code])
+        if role == QUANTITY_ROLE:
+            return self.quantities[item_code]
+        if role == Qt.ItemDataRole.FontRole:
+            return cached_font(14)
+        return None
+
+    def adjust(self, record, sign):
+        """Add (sign 1) or subtract (sign -1) an order's lines."""
+        for item_code, name, qty in record.lines:
+            self.quantities[item_code] = self.quantities.get(item_code, 0) + sign * qty
+            self.names[item_code] = name
+            self.changed.add(item_code)
+        if record.lines and not self.flush_scheduled:
+            self.flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def order_added(self, record):
+        if record.status in PREP_STATUSES:
+            self.adjust(record, 1)
+
+    def status_changed(self, record, old_status):
+        was_open, is_open = old_status in PREP_STATUSES, record.status in PREP_STATUSES
+        if was_open != is_open:
+            self.adjust(record, 1 if is_open else -1)
+
+    def order_removed(self, record):
+        if record.status in PREP_STATUSES:
+            self.adjust(record, -1)
+
+    def flush(self):
+        """Signal the rows whose quantities changed, adding rows for new items."""
+        self.flush_scheduled = False
+        if not self.changed:
+            return
+        changed, self.changed = self.changed, set()
+        new_codes = [item_code for item_code in changed if item_code not in self.rows]
+        if new_codes:
+            first = len(self.item_codes)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_codes) - 1)
+            for item_code in new_codes:
+                self.rows[item_code] = len(self.item_codes)
+                self.item_codes.append(item_code)
+            self.endInsertRows()
+        for item_code in changed:
+            row = self.rows[item_code]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, 1))
+
+
+class PrepListFilter(QSortFilterProxyModel):
+    """Hides items with nothing left to make and lists the largest quantities first."""
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.sourceModel().index(source_row, 1).data(QUANTITY_ROLE) > 1e-9  # Allow for float rounding
+
+
+class PrepListPanel(QWidget):
+    """Side panel listing how many of each item the open tickets need."""
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.model = PrepListModel(store, self)
+        self.proxy = PrepListFilter(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(QUANTITY_ROLE)
+        self.proxy.setDynamicSortFilter(True)  # Re-sorts only the rows that change
+        self.proxy.sort(1, Qt.SortOrder.DescendingOrder)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        title = QLabel("Prep list")
+        title.setFont(cached_font(14))
+        layout.addWidget(title)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setStyleSheet("""
+            QTableView {
+                background-color: #ffffff;
+                border: 1px solid #ddd;
+                gridline-color: #ddd;
+            }
+            QHeaderView::section {
+                background-color: #4CAF50; /* Green header, like the board */
+                color: white;
+                padding: 6px;
+                font-weight: bold;
+                border: 1px solid #45a049;
+            }
+        """)
+        layout.addWidget(self.table)
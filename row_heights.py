@@ -0,0 +1,54 @@
+# row_heights.py
+from collections import OrderedDict
+from PyQt6.QtCore import Qt
+from decouple import config
+from order_table_model import DESCRIPTION_COLUMN
+
+# Most measured (description, font, column widths) heights kept
+ROW_HEIGHT_CACHE_SIZE = config("ROW_HEIGHT_CACHE_SIZE", default=20000, cast=int)
+
+
+class RowHeightCache:
+    """Row heights of an order table, measured once per description, font and column widths.
+
+    Measuring a row lays out its word-wrapped Arabic description, which is
+    what made ResizeToContents slow on a large board. Rows with the same
+    content at the same widths share one measurement, so only rows whose
+    content or column widths changed are laid out again.
+    """
+    def __init__(self, view, maxsize: int = ROW_HEIGHT_CACHE_SIZE):
+        self.view = view
+        self.maxsize = maxsize
+        self.heights = OrderedDict()  # Key -> height, least recently used first
+        self.misses = 0
+
+    def layout_key(self):
+        """Return the part of the key shared by every row: the fonts and the column widths."""
+        model = self.view.model()
+        font = model.index(0, DESCRIPTION_COLUMN).data(Qt.ItemDataRole.FontRole) if model.rowCount() else None
+        widths = tuple(self.view.columnWidth(column) for column in range(model.columnCount()))
+        return self.view.font().key(), font.key() if font is not None else None, widths
+
+    def height(self, row: int, layout_key) -> int:
+        """Return the height of a row, measuring it only on a cache miss."""
+        model = self.view.model()
+        key = (model.record_of(model.order_id_at(row)).description, layout_key)
+        height = self.heights.get(key)
+        if height is not None:
+            self.heights.move_to_end(key)
+            return height
+        self.misses += 1
+        height = self.view.sizeHintForRow(row)
+        self.heights[key] = height
+        if len(self.heights) > self.maxsize:
+            self.heights.popitem(last=False)
+        return height
+
+    def resize_rows(self, first: int, last: int):
+        """Set the height of rows first..last from the cache."""
+        header = self.view.verticalHeader()
+        layout_key = self.layout_key()
+        for row in range(first, last + 1):
+            height = self.height(row, layout_key)
+            if header.sectionSize(row) != height:
+                header.resizeSection(row, height)
@@ -0,0 +1,69 @@
+# startup_profiler.py
+"""Times the phases of a cold start for ``main.py --profile-startup``.
+
+Phases on the GUI thread are timed directly. Connecting, querying and
+grouping happen on the database worker thread, so they are read from the
+metrics registry once the first poll has finished. Only the standard library
+is imported here, so the profiler can start before PyQt6.
+"""
+from contextlib import contextmanager
+import logging
+import os
+import sys
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+STARTUP_PROFILE_FILE = os.path.join(
+    os.getenv("LOCALAPPDATA", os.path.expanduser("~")), "ChiefView", "startup_profile.log"
+)
+
+
+class StartupProfiler:
+    """Durations of named startup phases and the times milestones were reached."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []      # (name, seconds)
+        self.milestones = []  # (name, seconds since start)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    def elapsed(self) -> float:
+        """Return the seconds since the profiler started."""
+        return time.perf_counter() - self.started
+
+    def milestone(self, name: str):
+        self.milestones.append((name, self.elapsed()))
+
+    def report_lines(self) -> list:
+        lines = [f"{name:<16} {seconds * 1000:>9.1f} ms" for name, seconds in self.phases]
+        lines += [f"{name:<16} {seconds * 1000:>9.1f} ms after start" for name, seconds in self.milestones]
+        return lines
+
+    def write_report(self, path: str = STARTUP_PROFILE_FILE):
+        """Log the report and append it to the startup profile file, which the packaged app has no console for."""
+        text = "\n".join([f"Startup profile {time.strftime('%Y-%m-%d %H:%M:%S')}", *self.report_lines()])
+        logger.info(text)
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(text + "\n\n")
+        except OSError as e:
+            logger.error(f"Error writing the startup profile: {e}")
+
+
+profiler = StartupProfiler()  # Started when main.py imports it
@@ -0,0 +1,94 @@
+# status_journal.py
+from database_connection import HOME_SECTION
+from decouple import config
+from typing import Dict, Iterable, List, Tuple
+import logging
+import os
+import sqlite3
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STATUS_JOURNAL_PATH = config(
+    "STATUS_JOURNAL_PATH",
+    default=os.path.join(os.getenv("LOCALAPPDATA", os.path.expanduser("~")), "ChiefView", "status_journal.db"),
+)
+
+
+class StatusJournal:
+    """Durable, append-only local log of status taps that are not yet in the database.
+
+    Each tap is committed here before the board shows it, so it survives
+    database outages and restarts. Entries are replayed in sequence order and
+    removed once the database has accepted or rejected them.
+    """
+    def __init__(self, path: str = STATUS_JOURNAL_PATH):
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the journal file, creating it if needed. Each thread opens its own connection."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA synchronous = FULL")  # A tap is only acknowledged once it is on disk
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS transitions (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                section TEXT NOT NULL
+            )
+        """)
+        return conn
+
+    def append(self, transitions: Iterable[Tuple[str, int, str, str]]) -> bool:
+        """Record (Section, OrderID, status, timestamp) transitions in one transaction; False if they could not be stored."""
+        try:
+            conn = self.connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO transitions (section, order_id, status, timestamp) VALUES (?, ?, ?, ?)", transitions
+                    )
+                return True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing to the status journal: {e}")
+            return False
+
+    def pending(self) -> List[Tuple[int, str, int, str, str]]:
+        """Return every unflushed (seq, Section, OrderID, status, timestamp) entry in the order the taps happened."""
+        try:
+            conn = self.connect()
+            try:
+                return conn.execute(
+                    "SELECT seq, section, order_id, status, timestamp FROM transitions ORDER BY seq"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading the status journal: {e}")
+            return []
+
+    def pending_statuses(self, section: str = HOME_SECTION) -> Dict[int, str]:
+        """Return OrderID -> latest unflushed status of a section, to show taps from before a restart."""
+        return {
+            order_id: status for _, entry_section, order_id, status, _ in self.pending() if entry_section == section
+        }
+
+    def acknowledge(self, seqs: Iterable[int]):
+        """Remove entries the database has accepted or rejected."""
+        try:
+            conn = self.connect()
+            try:
+                with conn:
+                    conn.executemany("DELETE FROM transitions WHERE seq = ?", ((seq,) for seq in seqs))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # The entries are replayed again later; the database write is idempotent
+            logger.error(f"Error removing flushed entries from the status journal: {e}")